@@ -1,9 +1,9 @@
-import json
+import functools
 import logging
+import orjson
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-import statistics
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -87,8 +87,8 @@ class AccuracyTracker:
     def load_ground_truth(self, ground_truth_file: str) -> Dict[str, Any]:
         """Load ground truth data from JSON file."""
         try:
-            with open(ground_truth_file, 'r', encoding='utf-8') as f:
-                self.ground_truth_data = json.load(f)
+            with open(ground_truth_file, 'rb') as f:
+                self.ground_truth_data = orjson.loads(f.read())
             logger.info(f"Loaded ground truth data from {ground_truth_file}")
             return self.ground_truth_data
         except Exception as e:
@@ -310,15 +310,17 @@ class AccuracyTracker:
     def _calculate_field_performance(self, model_accuracies: Dict[str, ModelAccuracy]) -> Dict[str, Dict[str, float]]:
         """Calculate performance metrics for each field across models."""
         field_performance = {}
+        # Index each model's field results once instead of scanning the list for every field
+        field_accuracies_by_model = {
+            model_name: {fa.field_name: fa for fa in reversed(model_accuracy.field_accuracies)}
+            for model_name, model_accuracy in model_accuracies.items()
+        }
         
         for field_name in self.field_definitions.keys():
             field_performance[field_name] = {}
             
-            for model_name, model_accuracy in model_accuracies.items():
-                field_accuracy = next(
-                    (fa for fa in model_accuracy.field_accuracies if fa.field_name == field_name),
-                    None
-                )
+            for model_name, field_accuracies in field_accuracies_by_model.items():
+                field_accuracy = field_accuracies.get(field_name)
                 
                 if field_accuracy:
                     field_performance[field_name][model_name] = {
@@ -356,9 +358,8 @@ class AccuracyTracker:
         # Field-specific recommendations
         problematic_fields = []
         for field_name, performance in field_performance.items():
-            avg_accuracy = statistics.mean([
-                perf.get("accuracy", 0) for perf in performance.values()
-            ])
+            # Plain float average; statistics.mean's exact arithmetic is not needed for 0/100 scores
+            avg_accuracy = sum(perf.get("accuracy", 0) for perf in performance.values()) / len(performance)
             if avg_accuracy < 70:
                 problematic_fields.append(field_name)
         
@@ -408,8 +409,9 @@ class AccuracyTracker:
                 "recommendations": report.recommendations
             }
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            # orjson emits UTF-8 bytes, so they are written without a text-mode re-encode
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
             
             logger.info(f"Accuracy report saved to {output_file}")
             
@@ -419,8 +421,8 @@ class AccuracyTracker:
     def load_accuracy_report(self, report_file: str) -> Optional[AccuracyReport]:
         """Load accuracy report from JSON file."""
         try:
-            with open(report_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(report_file, 'rb') as f:
+                data = orjson.loads(f.read())
             
             # Reconstruct the report object
             model_accuracies = {}
@@ -469,4 +471,15 @@ def track_extraction_accuracy(extracted_data: Dict[str, Any], ground_truth: Dict
                             test_name: str = "policy_extraction") -> AccuracyReport:
     """Convenience function to track extraction accuracy."""
     tracker = AccuracyTracker()
-    return tracker.compare_models(extracted_data, ground_truth, test_name) 
\ No newline at end of file
+    return tracker.compare_models(extracted_data, ground_truth, test_name) 
+
+@functools.lru_cache(maxsize=4)
+def load_ground_truth_cached(ground_truth_file: str, mtime: float) -> Dict[str, Any]:
+    """
+    Load a ground-truth file, parsing each version of it only once per process.
+    
+    The file's modification time is part of the cache key: pass
+    os.path.getmtime(ground_truth_file), and an edited file is re-read on the next call.
+    The returned dict is shared between callers and must not be modified.
+    """
+    return AccuracyTracker().load_ground_truth(ground_truth_file)
@@ -0,0 +1,188 @@
+"""
+Provider Batch API Extraction
+
+This module submits policy extraction prompts through the OpenAI and Mistral batch
+endpoints instead of the interactive chat endpoints. Batch jobs are billed at about
+half the interactive price and do not count against the synchronous rate limits, but
+results only arrive once the job finishes (minutes, at most the completion window),
+so this path is meant for bulk/overnight directory runs where latency does not matter.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Any, Union
+
+from llm_dispatch import PROVIDER_REGISTRY, cached_extract
+
+logger = logging.getLogger(__name__)
+
+BATCH_POLL_INTERVAL_SECONDS = float(os.getenv('BATCH_POLL_INTERVAL_SECONDS', '30'))
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+OPENAI_BATCH_PENDING = ("validating", "in_progress", "finalizing")
+MISTRAL_BATCH_PENDING = ("QUEUED", "RUNNING")
+
+def _to_jsonl(lines: List[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8")
+
+def _parse_content(provider: str, content: str) -> Optional[Dict[str, Any]]:
+    """Validate one completion's JSON content against the extraction schema."""
+    # Imported with the provider SDKs, only once a batch has actually come back
+    from schemas import ExtractedFields
+    try:
+        return ExtractedFields(**json.loads(content.strip())).model_dump()
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse {provider} batch response as JSON: {e}")
+        logger.error(f"Raw response: {content[:200]}...")
+    except Exception as e:
+        logger.error(f"Failed to validate {provider} batch response against schema: {e}")
+    return None
+
+def _collect_results(provider: str, output_jsonl: str, custom_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Match batch output lines back to their requests by custom_id.
+
+    Output lines are not guaranteed to come back in submission order, and requests
+    that failed inside the job have no usable body; both end up as None.
+    """
+    results = {custom_id: None for custom_id in custom_ids}
+    for line in output_jsonl.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        if custom_id not in results:
+            continue
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            logger.error(f"{provider} batch request {custom_id} failed: {record.get('error') or response.get('status_code')}")
+            continue
+        content = response["body"]["choices"][0]["message"]["content"]
+        results[custom_id] = _parse_content(provider, content)
+    return results
+
+def submit_openai_batch(prompts: Dict[str, str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run prompts through the OpenAI Batch API and wait for the results.
+
+    Args:
+        prompts: Mapping of custom_id to prompt text
+
+    Returns:
+        Dictionary mapping custom_id to the validated extraction (None on failure)
+    """
+    from openai_extract import client, _request_kwargs
+
+    lines = [
+        {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": _request_kwargs(prompt)}
+        for custom_id, prompt in prompts.items()
+    ]
+    batch_file = client.files.create(file=("policy_batch.jsonl", _to_jsonl(lines)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+    logger.info(f"Submitted OpenAI batch {batch.id} with {len(lines)} request(s)")
+
+    while batch.status in OPENAI_BATCH_PENDING:
+        time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        return {custom_id: None for custom_id in prompts}
+
+    logger.info(f"OpenAI batch {batch.id} completed")
+    return _collect_results("openai", client.files.content(batch.output_file_id).text, prompts)
+
+def submit_mistral_batch(prompts: Dict[str, str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run prompts through the Mistral batch jobs API and wait for the results.
+
+    Args:
+        prompts: Mapping of custom_id to prompt text
+
+    Returns:
+        Dictionary mapping custom_id to the validated extraction (None on failure)
+    """
+    from mistral_extract import client, _request_kwargs
+
+    # The model is set once on the job, not per request
+    request_kwargs = {custom_id: _request_kwargs(prompt) for custom_id, prompt in prompts.items()}
+    model = next(iter(request_kwargs.values()))["model"]
+    lines = [
+        {"custom_id": custom_id, "body": {key: value for key, value in kwargs.items() if key != "model"}}
+        for custom_id, kwargs in request_kwargs.items()
+    ]
+    batch_file = client.files.upload(
+        file={"file_name": "policy_batch.jsonl", "content": _to_jsonl(lines)},
+        purpose="batch"
+    )
+    job = client.batch.jobs.create(input_files=[batch_file.id], model=model, endpoint=BATCH_ENDPOINT)
+    logger.info(f"Submitted Mistral batch {job.id} with {len(lines)} request(s)")
+
+    while job.status in MISTRAL_BATCH_PENDING:
+        time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+        job = client.batch.jobs.get(job_id=job.id)
+
+    if job.status != "SUCCESS" or not job.output_file:
+        logger.error(f"Mistral batch {job.id} ended with status {job.status}")
+        return {custom_id: None for custom_id in prompts}
+
+    logger.info(f"Mistral batch {job.id} completed")
+    output = client.files.download(file_id=job.output_file).read().decode("utf-8")
+    return _collect_results("mistral", output, prompts)
+
+# Providers with a batch endpoint; anything else falls back to the interactive call
+BATCH_SUBMITTERS = {
+    "openai": submit_openai_batch,
+    "mistral": submit_mistral_batch,
+}
+
+async def _extract_with_batch(provider: str, custom_id: str, metadata_json: str) -> Optional[Dict[str, Any]]:
+    prompt = PROVIDER_REGISTRY[provider][0](metadata_json)
+    # The SDK calls and polling block, so each provider's job is waited on in its own thread
+    results = await asyncio.to_thread(BATCH_SUBMITTERS[provider], {custom_id: prompt})
+    return results[custom_id]
+
+async def extract_all_batch(metadata_json: Union[str, bytes], custom_id: str,
+                            providers: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run policy extraction through the providers' batch APIs where they have one.
+
+    Providers without a batch endpoint (Gemini) use the regular cached interactive
+    call. All providers are waited on concurrently.
+
+    Args:
+        metadata_json: Serialized document metadata embedded into each prompt
+        custom_id: Identifier of this extraction inside the batch jobs (e.g. the directory name)
+        providers: Provider names to query, in result order
+
+    Returns:
+        Dictionary mapping provider name to its extraction result (None on failure)
+    """
+    providers = list(providers)
+    if isinstance(metadata_json, bytes):
+        metadata_json = metadata_json.decode("utf-8")
+
+    results = await asyncio.gather(
+        *(
+            _extract_with_batch(provider, custom_id, metadata_json) if provider in BATCH_SUBMITTERS
+            else cached_extract(provider, metadata_json)
+            for provider in providers
+        ),
+        return_exceptions=True
+    )
+
+    extraction_results = {}
+    for provider, result in zip(providers, results):
+        if isinstance(result, Exception):
+            logger.error(f"{provider} batch extraction failed: {result}")
+            result = None
+        extraction_results[provider] = result
+    return extraction_results
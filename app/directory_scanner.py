@@ -6,9 +6,10 @@ for processing medical documents from various directory structures.
 """
 
 import os
+import re
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Callable, Set
+from typing import List, Dict, Optional, Callable, Set, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -283,4 +284,32 @@ def filter_by_size(min_size: int = 0, max_size: int = None) -> Callable[[Path],
             return True
         except (OSError, IOError):
             return False
-    return filter_func 
\ No newline at end of file
+    return filter_func 
+
+# One C-level scan per file name instead of lower() + substring + suffix checks
+_POLICY_PDF_RE = re.compile(r'policy.*\.pdf\Z', re.IGNORECASE | re.DOTALL)
+
+def iter_policy_pdfs(root: str = "data") -> Iterator[str]:
+    """
+    Lazily yield paths of policy PDFs under root.
+    
+    Uses os.scandir so file names and types come from the directory listing
+    without a stat call per entry, and callers that only need the first
+    match stop the traversal there. Files in a directory are yielded before
+    its subdirectories are descended into, matching os.walk's top-down order.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file() and _POLICY_PDF_RE.search(entry.name):
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {directory}: {e}")
+            continue
+        stack.extend(reversed(subdirectories))
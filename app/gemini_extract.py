@@ -1,8 +1,10 @@
 from google import genai
 from dotenv import load_dotenv
 import os
+import asyncio
 import logging
 import json
+import weakref
 from schemas import ExtractedFields
 
 logging.basicConfig(level=logging.INFO)
@@ -11,10 +13,69 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Module-level client shared by every call so its HTTP connection pool is reused
 client = genai.Client(api_key=GEMINI_API_KEY)
 
+# The async transport is bound to the event loop it first runs on, and the entry points
+# start a fresh loop per file or directory, so one async client is kept per loop
+_async_clients = weakref.WeakKeyDictionary()
+
+def _get_async_client():
+    """Return the Gemini async client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = genai.Client(api_key=GEMINI_API_KEY).aio
+        _async_clients[loop] = async_client
+    return async_client
+
 model = "gemini-2.0-flash"
 
+def _parse_response(response):
+    # Parse the response and validate it against our schema
+    try:
+        # Extract JSON from markdown code blocks if present
+        response_text = response.text.strip()
+        
+        # If the response starts with ```json and ends with ```, extract the JSON part
+        if response_text.startswith("```json"):
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.rfind("```")
+            if json_end > json_start:
+                response_text = response_text[json_start:json_end].strip()
+        elif response_text.startswith("```"):
+            json_start = response_text.find("```") + 3
+            json_end = response_text.rfind("```")
+            if json_end > json_start:
+                response_text = response_text[json_start:json_end].strip()
+        
+        # Parse the JSON response
+        response_data = json.loads(response_text)
+        
+        # Convert data types to match schema requirements
+        converted_data = {}
+        for key, value in response_data.items():
+            if value is None:
+                converted_data[key] = "null"
+            elif isinstance(value, (int, float)):
+                converted_data[key] = str(value)
+            else:
+                converted_data[key] = str(value) if value is not None else "null"
+        
+        # Validate against our Pydantic schema
+        validated_data = ExtractedFields(**converted_data)
+        
+        # Return as dictionary for JSON serialization
+        return validated_data.model_dump()
+        
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse Gemini response as JSON: {e}")
+        logger.error(f"Raw response: {response.text[:200]}...")
+        return None
+    except Exception as e:
+        logger.error(f"Failed to validate Gemini response against schema: {e}")
+        return None
+
 def extract_fields_with_gemini(prompt):
     logger.info("Calling Gemini API...")
     try:
@@ -24,51 +85,20 @@ def extract_fields_with_gemini(prompt):
         )
 
         logger.info("Gemini API call successful.")
-        
-        # Parse the response and validate it against our schema
-        try:
-            # Extract JSON from markdown code blocks if present
-            response_text = response.text.strip()
-            
-            # If the response starts with ```json and ends with ```, extract the JSON part
-            if response_text.startswith("```json"):
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.rfind("```")
-                if json_end > json_start:
-                    response_text = response_text[json_start:json_end].strip()
-            elif response_text.startswith("```"):
-                json_start = response_text.find("```") + 3
-                json_end = response_text.rfind("```")
-                if json_end > json_start:
-                    response_text = response_text[json_start:json_end].strip()
-            
-            # Parse the JSON response
-            response_data = json.loads(response_text)
-            
-            # Convert data types to match schema requirements
-            converted_data = {}
-            for key, value in response_data.items():
-                if value is None:
-                    converted_data[key] = "null"
-                elif isinstance(value, (int, float)):
-                    converted_data[key] = str(value)
-                else:
-                    converted_data[key] = str(value) if value is not None else "null"
-            
-            # Validate against our Pydantic schema
-            validated_data = ExtractedFields(**converted_data)
-            
-            # Return as dictionary for JSON serialization
-            return validated_data.model_dump()
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Gemini response as JSON: {e}")
-            logger.error(f"Raw response: {response.text[:200]}...")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to validate Gemini response against schema: {e}")
-            return None
-            
+        return _parse_response(response)
+
     except Exception as e:
         logger.error(f"Error during Gemini extraction: {e}")
-        return None
\ No newline at end of file
+        return None
+
+async def extract_fields_with_gemini_async(prompt):
+    """Async variant of extract_fields_with_gemini for concurrent provider fan-out."""
+    logger.info("Calling Gemini API (async)...")
+    # API/transport errors propagate so the dispatcher can tell an outage from a bad answer
+    response = await _get_async_client().models.generate_content(
+        model=model,
+        contents=prompt
+    )
+
+    logger.info("Gemini API call successful.")
+    return _parse_response(response)
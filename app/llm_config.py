@@ -54,19 +54,34 @@ class LLMConfig:
                 'api_key': os.getenv('OPENAI_API_KEY'),
                 'model': os.getenv('OPENAI_MODEL', 'gpt-4'),
                 'temperature': float(os.getenv('OPENAI_TEMPERATURE', '0.1')),
-                'max_tokens': int(os.getenv('OPENAI_MAX_TOKENS', '4000'))
+                'max_tokens': int(os.getenv('OPENAI_MAX_TOKENS', '4000')),
+                'timeout': float(os.getenv('OPENAI_TIMEOUT', '120')),
+                'requests_per_minute': int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', '0')),
+                'tokens_per_minute': int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '0')),
+                'max_concurrent_requests': int(os.getenv('OPENAI_MAX_CONCURRENT_REQUESTS', os.getenv('LLM_MAX_CONCURRENT_REQUESTS', '0'))),
+                'context_tokens': int(os.getenv('OPENAI_CONTEXT_TOKENS', '128000'))
             },
             LLMProvider.MISTRAL.value: {
                 'api_key': os.getenv('MISTRAL_API_KEY'),
                 'model': os.getenv('MISTRAL_MODEL', 'mistral-large-latest'),
                 'temperature': float(os.getenv('MISTRAL_TEMPERATURE', '0.1')),
-                'max_tokens': int(os.getenv('MISTRAL_MAX_TOKENS', '4000'))
+                'max_tokens': int(os.getenv('MISTRAL_MAX_TOKENS', '4000')),
+                'timeout': float(os.getenv('MISTRAL_TIMEOUT', '120')),
+                'requests_per_minute': int(os.getenv('MISTRAL_REQUESTS_PER_MINUTE', '0')),
+                'tokens_per_minute': int(os.getenv('MISTRAL_TOKENS_PER_MINUTE', '0')),
+                'max_concurrent_requests': int(os.getenv('MISTRAL_MAX_CONCURRENT_REQUESTS', os.getenv('LLM_MAX_CONCURRENT_REQUESTS', '0'))),
+                'context_tokens': int(os.getenv('MISTRAL_CONTEXT_TOKENS', '128000'))
             },
             LLMProvider.GEMINI.value: {
                 'api_key': os.getenv('GEMINI_API_KEY'),
                 'model': os.getenv('GEMINI_MODEL', 'gemini-1.5-pro'),
                 'temperature': float(os.getenv('GEMINI_TEMPERATURE', '0.1')),
-                'max_tokens': int(os.getenv('GEMINI_MAX_TOKENS', '4000'))
+                'max_tokens': int(os.getenv('GEMINI_MAX_TOKENS', '4000')),
+                'timeout': float(os.getenv('GEMINI_TIMEOUT', '120')),
+                'requests_per_minute': int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', '0')),
+                'tokens_per_minute': int(os.getenv('GEMINI_TOKENS_PER_MINUTE', '0')),
+                'max_concurrent_requests': int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', os.getenv('LLM_MAX_CONCURRENT_REQUESTS', '0'))),
+                'context_tokens': int(os.getenv('GEMINI_CONTEXT_TOKENS', '1000000'))
             }
         }
     
@@ -0,0 +1,423 @@
+"""
+Concurrent LLM Provider Dispatch
+
+This module fans policy extraction out to the configured LLM providers at once.
+Provider calls are network-bound, so running them concurrently makes the wall time
+of the extraction step roughly that of the slowest provider rather than the sum.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import os
+import re
+import time
+import weakref
+from typing import Dict, Iterable, Optional, Any, Union
+
+import orjson
+
+from llm_config import get_llm_settings
+from prompts import get_openai_policy_prompt, get_mistral_policy_prompt, get_gemini_policy_prompt
+
+logger = logging.getLogger(__name__)
+
+ALL_PROVIDERS = ("openai", "mistral", "gemini")
+
+# Responses are cached on disk by prompt hash so re-runs on identical input skip the paid calls
+ENABLE_LLM_CACHE = os.getenv('ENABLE_LLM_CACHE', 'true').lower() == 'true'
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join('output', '.cache'))
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# Runs of whitespace, raw or JSON-escaped inside the embedded metadata, in a prompt
+_CACHE_KEY_WHITESPACE_RE = re.compile(r'(?:\s|\\[nrt])+')
+
+# Attempts per provider call; a timed-out attempt is retried after an exponential backoff
+LLM_RETRY_ATTEMPTS = int(os.getenv('LLM_RETRY_ATTEMPTS', '2'))
+DEFAULT_PROVIDER_TIMEOUT = 120.0
+
+# Rate-limited (HTTP 429) calls are retried this many times, waiting for the provider's
+# Retry-After when it sends one (capped) or an exponential backoff otherwise
+LLM_RATE_LIMIT_RETRIES = int(os.getenv('LLM_RATE_LIMIT_RETRIES', '3'))
+LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv('LLM_RATE_LIMIT_MAX_WAIT', '60'))
+
+# After this many failed calls in a row a provider is skipped for the reset window (0 disables)
+LLM_CIRCUIT_BREAKER_FAILURES = int(os.getenv('LLM_CIRCUIT_BREAKER_FAILURES', '3'))
+LLM_CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv('LLM_CIRCUIT_BREAKER_RESET_SECONDS', '30'))
+
+# Rough prompt size estimate used for tokens-per-minute budgeting (about 4 characters per token)
+CHARS_PER_TOKEN = 4
+
+# Provider name -> (prompt builder, extractor module, async extractor name).
+# Extractor modules pull in heavy SDKs, so they are only imported when a provider is first used.
+PROVIDER_REGISTRY = {
+    "openai": (get_openai_policy_prompt, "openai_extract", "extract_fields_with_openai_async"),
+    "mistral": (get_mistral_policy_prompt, "mistral_extract", "extract_fields_with_mistral_async"),
+    "gemini": (get_gemini_policy_prompt, "gemini_extract", "extract_fields_with_gemini_async"),
+}
+
+def _get_extractor(provider: str):
+    """Import the provider's extractor module on demand and return its async extractor."""
+    _, module_name, extractor_name = PROVIDER_REGISTRY[provider]
+    return getattr(importlib.import_module(module_name), extractor_name)
+
+class RateLimiter:
+    """
+    Token-bucket limiter for a provider's requests-per-minute and tokens-per-minute quotas.
+    
+    Budgets refill continuously; a limit of 0 disables that budget. State is only
+    touched between awaits, so callers on one event loop need no extra locking.
+    """
+    
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_refill) / 60.0
+        self._last_refill = now
+        self._available_requests = min(self.requests_per_minute, self._available_requests + elapsed_minutes * self.requests_per_minute)
+        self._available_tokens = min(self.tokens_per_minute, self._available_tokens + elapsed_minutes * self.tokens_per_minute)
+    
+    async def acquire(self, tokens: int = 0):
+        """Wait until one request costing ``tokens`` fits in both budgets, then consume it."""
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            self._refill()
+            request_wait = 0.0
+            token_wait = 0.0
+            if self.requests_per_minute and self._available_requests < 1:
+                request_wait = (1 - self._available_requests) * 60.0 / self.requests_per_minute
+            if self.tokens_per_minute and self._available_tokens < tokens:
+                token_wait = (tokens - self._available_tokens) * 60.0 / self.tokens_per_minute
+            wait = max(request_wait, token_wait)
+            if wait <= 0:
+                if self.requests_per_minute:
+                    self._available_requests -= 1
+                if self.tokens_per_minute:
+                    self._available_tokens -= tokens
+                return
+            await asyncio.sleep(wait)
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+def _get_rate_limiter(provider: str) -> RateLimiter:
+    """Return the process-wide limiter for a provider, configured from its LLM settings."""
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        settings = get_llm_settings(provider)
+        limiter = RateLimiter(settings.get('requests_per_minute', 0), settings.get('tokens_per_minute', 0))
+        _rate_limiters[provider] = limiter
+    return limiter
+
+class CircuitBreaker:
+    """
+    Skips a provider for a cooldown once its calls keep failing.
+    
+    After failure_threshold failed calls in a row the circuit opens and calls are
+    refused for reset_seconds. The first call after that goes through alone as a
+    probe: success closes the circuit, failure restarts the cooldown. A threshold
+    of 0 disables the breaker.
+    """
+    
+    def __init__(self, failure_threshold: int = 0, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+    
+    def allow_request(self) -> bool:
+        """Whether a call may be made now; claims the probe slot once the cooldown is over."""
+        if self._probing:
+            return False
+        if self._opened_at is None:
+            return True
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return False
+        self._opened_at = None
+        self._probing = True
+        return True
+    
+    def record_success(self):
+        self.failures = 0
+        self._probing = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.failure_threshold and self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+    
+    def release(self):
+        """Give back a claimed probe without counting the call; the next call probes instead."""
+        if self._probing:
+            self._probing = False
+            self._opened_at = time.monotonic() - self.reset_seconds
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def _get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider."""
+    breaker = _circuit_breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(LLM_CIRCUIT_BREAKER_FAILURES, LLM_CIRCUIT_BREAKER_RESET_SECONDS)
+        _circuit_breakers[provider] = breaker
+    return breaker
+
+# Per event loop, since asyncio semaphores bind to the loop they are first contended on
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _get_semaphore(provider: str) -> Optional[asyncio.Semaphore]:
+    """Return the semaphore capping the provider's in-flight requests, or None when uncapped."""
+    loop_semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in loop_semaphores:
+        max_concurrent = get_llm_settings(provider).get('max_concurrent_requests', 0)
+        loop_semaphores[provider] = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+    return loop_semaphores[provider]
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for budgeting, without a tokenizer dependency."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+class ProviderRateLimited(Exception):
+    """A provider kept answering with rate-limit errors after every retry."""
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether an SDK error is a rate-limit (HTTP 429) response, without importing the SDKs."""
+    response = getattr(error, 'response', None) or getattr(error, 'raw_response', None)
+    for status in (getattr(error, 'status_code', None), getattr(error, 'code', None), getattr(response, 'status_code', None)):
+        if status == 429:
+            return True
+    return type(error).__name__ == 'RateLimitError'
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait in its Retry-After header, if it sent one."""
+    response = getattr(error, 'response', None) or getattr(error, 'raw_response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get('retry-after')))
+    except (TypeError, ValueError):
+        return None
+
+async def _attempt_extraction(provider: str, extractor, prompt: str, prompt_tokens: int,
+                              limiter: RateLimiter, timeout: float) -> Optional[Dict[str, Any]]:
+    """One provider call: wait for rate-limit budget, then await the extractor under the timeout."""
+    await limiter.acquire(prompt_tokens)
+    logger.info(f"Extracting with {provider}...")
+    # A fresh coroutine per attempt so a timed-out call can be re-issued
+    return await asyncio.wait_for(extractor(prompt), timeout)
+
+async def _extract_with_provider(provider: str, prompt: str) -> Optional[Dict[str, Any]]:
+    """Await the provider's extraction call for a built prompt under a per-provider timeout."""
+    settings = get_llm_settings(provider)
+    prompt_tokens = estimate_tokens(prompt)
+    
+    # Requests that cannot fit the context window would only come back as a 4xx after the upload
+    context_tokens = settings.get('context_tokens')
+    if context_tokens and prompt_tokens + settings.get('max_tokens', 0) > context_tokens:
+        logger.error(f"Skipping {provider}: prompt is ~{prompt_tokens} tokens, over its {context_tokens}-token context window")
+        return None
+    
+    # During an outage, fail fast instead of waiting out the timeouts on every call
+    breaker = _get_circuit_breaker(provider)
+    if not breaker.allow_request():
+        logger.warning(f"Skipping {provider}: circuit open after {breaker.failures} consecutive failure(s)")
+        return None
+    
+    # Only transport failures (timeouts, API errors) count against the provider: a reply
+    # that could not be parsed still shows the provider is up
+    try:
+        result = await _call_with_retries(provider, prompt, prompt_tokens, settings)
+    except asyncio.CancelledError:
+        # Our own cancellation says nothing about the provider, but must not hold the probe
+        breaker.release()
+        raise
+    except ProviderRateLimited as e:
+        # Throttling means the provider is up but busy, so it does not trip the breaker either
+        breaker.release()
+        logger.error(f"{provider} extraction failed: {e}")
+        return None
+    except Exception as e:
+        breaker.record_failure()
+        logger.error(f"{provider} extraction failed: {e}")
+        return None
+    breaker.record_success()
+    return result
+
+async def _call_with_retries(provider: str, prompt: str, prompt_tokens: int,
+                             settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Call the provider, re-issuing timed-out and rate-limited attempts after a backoff.
+    
+    Raises asyncio.TimeoutError once every attempt has timed out and ProviderRateLimited
+    once the rate-limit retries are used up; other API errors propagate as-is.
+    """
+    extractor = _get_extractor(provider)
+    timeout = settings.get('timeout', DEFAULT_PROVIDER_TIMEOUT)
+    limiter = _get_rate_limiter(provider)
+    semaphore = _get_semaphore(provider)
+    timeouts = 0
+    rate_limited = 0
+    
+    while True:
+        try:
+            if semaphore is None:
+                return await _attempt_extraction(provider, extractor, prompt, prompt_tokens, limiter, timeout)
+            async with semaphore:
+                return await _attempt_extraction(provider, extractor, prompt, prompt_tokens, limiter, timeout)
+        except asyncio.TimeoutError:
+            timeouts += 1
+            logger.warning(f"{provider} did not respond within {timeout:.0f}s (attempt {timeouts}/{LLM_RETRY_ATTEMPTS})")
+            if timeouts >= LLM_RETRY_ATTEMPTS:
+                raise asyncio.TimeoutError(f"timed out after {timeouts} attempt(s)")
+            await asyncio.sleep(2 ** (timeouts - 1))
+        except Exception as e:
+            if not _is_rate_limited(e):
+                raise
+            rate_limited += 1
+            if rate_limited > LLM_RATE_LIMIT_RETRIES:
+                raise ProviderRateLimited(f"still rate limited after {LLM_RATE_LIMIT_RETRIES} retries") from e
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = 2 ** (rate_limited - 1)
+            delay = min(delay, LLM_RATE_LIMIT_MAX_WAIT)
+            logger.warning(f"{provider} is rate limiting requests; retrying in {delay:.1f}s ({rate_limited}/{LLM_RATE_LIMIT_RETRIES})")
+            await asyncio.sleep(delay)
+
+def set_llm_cache_enabled(enabled: bool):
+    """Turn the response cache on or off for this process (e.g. for a forced refresh)."""
+    global ENABLE_LLM_CACHE
+    ENABLE_LLM_CACHE = enabled
+
+def _normalized_digest(text: str) -> str:
+    return hashlib.sha256(_CACHE_KEY_WHITESPACE_RE.sub(" ", text).strip().encode("utf-8")).hexdigest()
+
+def metadata_cache_digest(metadata_json: str) -> str:
+    """
+    Hash the serialized metadata for the response cache keys.
+    
+    Whitespace runs are collapsed first, so re-extractions of a document whose text
+    only differs in line breaks or spacing (OCR and PDF text layers vary there)
+    reuse the earlier answer. Any other difference in the text is a miss.
+    """
+    return _normalized_digest(metadata_json)
+
+def prompt_cache_key(provider: str, metadata_digest: str) -> str:
+    """
+    Build a provider's cache key from its prompt template and the metadata digest.
+    
+    Prompts are the provider's template around the metadata, so the multi-MB document
+    text is hashed once per run (metadata_cache_digest) rather than once per provider;
+    only the small template is hashed here, which still makes a template change a miss.
+    """
+    template_digest = _normalized_digest(PROVIDER_REGISTRY[provider][0](""))
+    return hashlib.sha256(f"{provider}:{template_digest}:{metadata_digest}".encode("utf-8")).hexdigest()
+
+def _cache_path(key: str) -> str:
+    return os.path.join(LLM_CACHE_DIR, f"{key}.json")
+
+def _load_cached_result(provider: str, key: str) -> Optional[Dict[str, Any]]:
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > LLM_CACHE_TTL_SECONDS:
+            logger.info(f"Cached {provider} result for {key[:12]} has expired")
+            return None
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable {provider} cache entry: {e}")
+        return None
+
+def _store_cached_result(key: str, result: Dict[str, Any]):
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    path = _cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(result))
+    # Atomic rename so a crashed run never leaves a truncated entry behind
+    os.replace(tmp_path, path)
+
+async def cached_extract(provider: str, metadata_json: str,
+                        metadata_digest: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached result for this provider's prompt, calling the provider on a miss.
+    
+    Callers querying several providers pass metadata_digest so the metadata is hashed once.
+    """
+    prompt = PROVIDER_REGISTRY[provider][0](metadata_json)
+    if metadata_digest is None:
+        metadata_digest = metadata_cache_digest(metadata_json)
+    key = prompt_cache_key(provider, metadata_digest)
+    if ENABLE_LLM_CACHE:
+        cached = _load_cached_result(provider, key)
+        if cached is not None:
+            logger.info(f"Using cached {provider} result for {key[:12]}")
+            return cached
+    
+    result = await _extract_with_provider(provider, prompt)
+    
+    if ENABLE_LLM_CACHE and result is not None:
+        try:
+            _store_cached_result(key, result)
+        except OSError as e:
+            logger.warning(f"Failed to cache {provider} result: {e}")
+    return result
+
+async def _timed(provider: str, coro, timings: Dict[str, float]):
+    """Await coro and record its wall time under the provider's name, even if it fails."""
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[provider] = time.perf_counter() - start
+
+async def extract_all(metadata_json: Union[str, bytes], providers: Iterable[str] = ALL_PROVIDERS,
+                      timings: Optional[Dict[str, float]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run policy extraction with several providers concurrently.
+    
+    The metadata is serialized once by the caller and every provider's prompt is
+    built from that single string; UTF-8 bytes (e.g. straight from orjson) are
+    decoded once here. Cache entries are keyed by provider, prompt template and
+    a single content hash of the metadata, so a template change never serves a
+    stale answer.
+    
+    Args:
+        metadata_json: Serialized document metadata embedded into each prompt
+        providers: Provider names to query, in result order
+        timings: Optional dict filled with each provider's wall time in seconds
+            (near zero for cache hits)
+        
+    Returns:
+        Dictionary mapping provider name to its extraction result (None on failure)
+    """
+    providers = list(providers)
+    if isinstance(metadata_json, bytes):
+        metadata_json = metadata_json.decode("utf-8")
+    if timings is None:
+        timings = {}
+    # Every provider's cache key shares this one hash of the document text
+    metadata_digest = metadata_cache_digest(metadata_json)
+    results = await asyncio.gather(
+        *(_timed(provider, cached_extract(provider, metadata_json, metadata_digest), timings) for provider in providers),
+        return_exceptions=True
+    )
+    
+    extraction_results = {}
+    for provider, result in zip(providers, results):
+        if isinstance(result, Exception):
+            logger.error(f"{provider} extraction failed: {result}")
+            result = None
+        extraction_results[provider] = result
+    return extraction_results
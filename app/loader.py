@@ -1,13 +1,16 @@
 import os
 import pdfplumber
-from utils import ocr_from_image, ocr_from_scanned_pdf
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+from utils import ocr_from_image, ocr_from_scanned_pdf, ocr_from_fitz_doc
 import logging
 from pathlib import Path
-from openai_extract import extract_fields_with_openai
-from mistral_extract import extract_fields_with_mistral
-from gemini_extract import extract_fields_with_gemini
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
 from prompts import get_openai_policy_prompt, get_mistral_policy_prompt, get_gemini_policy_prompt
 from prompt_retrieve_text import get_openai_policy_prompt as get_openai_single_prompt, get_mistral_policy_prompt as get_mistral_single_prompt, get_gemini_policy_prompt as get_gemini_single_prompt
 from validation import validate_extraction_result
@@ -15,6 +18,59 @@ from validation import validate_extraction_result
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Validation is CPU-only, so it runs here while the next provider call waits on the network
+_validation_executor = ThreadPoolExecutor(max_workers=3)
+
+# Worker processes for document text extraction; set to 1 on slow disks to read serially
+LOAD_DOCUMENTS_NUMBER_OF_THREADS = int(os.getenv('LOAD_DOCUMENTS_NUMBER_OF_THREADS', max(1, (os.cpu_count() or 2) - 1)))
+
+# File suffix -> extraction route
+_SUFFIX_TO_TYPE = {'.pdf': 'pdf', '.jpg': 'image', '.jpeg': 'image', '.png': 'image'}
+
+# First pages with fewer characters than this are treated as scanned images
+SCANNED_PDF_CHAR_THRESHOLD = 20
+
+# Text-layer backend: "pymupdf" (default, much faster) or "pdfplumber"
+PDF_BACKEND = os.getenv('LOADER_PDF_BACKEND', 'pymupdf').lower()
+
+def _read_pdf_text(path):
+    """Return (text, source) for a PDF, OCR-ing scanned files from the already open document."""
+    # Probe only the first page so scanned PDFs skip the full text-layer parse
+    if PDF_BACKEND == 'pymupdf' and fitz is not None:
+        with fitz.open(path) as doc:
+            if doc.page_count and len(doc[0].get_text()) >= SCANNED_PDF_CHAR_THRESHOLD:
+                extracted = "\n".join(page.get_text() for page in doc)
+                if extracted.strip():
+                    return extracted, 'pdf_text'
+            logger.info(f"Text not found in {path}. Attempting OCR.")
+            return ocr_from_fitz_doc(doc), 'ocr'
+    with pdfplumber.open(path) as pdf:
+        if pdf.pages and len(pdf.pages[0].chars) >= SCANNED_PDF_CHAR_THRESHOLD:
+            extracted = "\n".join(page.extract_text() or "" for page in pdf.pages)
+            if extracted.strip():
+                return extracted, 'pdf_text'
+    logger.info(f"Text not found in {path}. Attempting OCR.")
+    return ocr_from_scanned_pdf(path), 'ocr'
+
+def _extract_pdf_into_entry(path, entry):
+    """Fill a metadata entry with PDF text, going straight to OCR for scanned PDFs."""
+    try:
+        logger.info(f"Extracting text from {path}")
+        text, source = _read_pdf_text(str(path))
+        entry['source'] = source
+        if text:
+            entry['extraction_success'] = True
+            entry['text'] = text
+            if source == 'ocr':
+                logger.info(f"OCR text: {text}")
+        else:
+            entry['error'] = 'OCR failed'
+            logger.error(f"OCR failed for {path}")
+    except Exception as e:
+        entry['source'] = 'pdf_text'
+        entry['error'] = str(e)
+        logger.error(f"Error extracting text from {path}: {e}")
+
 def extract_single_file_with_metadata(file_path, base_dir=None):
     """Extract text and metadata from a single file."""
     if base_dir is None:
@@ -26,7 +82,7 @@ def extract_single_file_with_metadata(file_path, base_dir=None):
         return None
     
     rel_path = os.path.relpath(file_path, base_dir)
-    file_type = 'pdf' if file_path.suffix.lower() == '.pdf' else 'image' if file_path.suffix.lower() in [".jpg", ".jpeg", ".png"] else 'other'
+    file_type = _SUFFIX_TO_TYPE.get(file_path.suffix.lower(), 'other')
     
     entry = {
         'filename': str(rel_path),
@@ -38,30 +94,7 @@ def extract_single_file_with_metadata(file_path, base_dir=None):
     }
     
     if file_type == 'pdf':
-        try:
-            logger.info(f"Extracting text from {file_path}")
-            with pdfplumber.open(file_path) as pdf:
-                extracted = "\n".join([page.extract_text() or "" for page in pdf.pages])
-                if extracted.strip():
-                    entry['source'] = 'pdf_text'
-                    entry['extraction_success'] = True
-                    entry['text'] = extracted
-                else:
-                    logger.info(f"Text not found in {file_path}. Attempting OCR.")
-                    ocr_text = ocr_from_scanned_pdf(str(file_path))
-                    if ocr_text:
-                        entry['source'] = 'ocr'
-                        entry['extraction_success'] = True
-                        entry['text'] = ocr_text
-                        logger.info(f"OCR text: {ocr_text}")
-                    else:
-                        entry['source'] = 'ocr'
-                        entry['error'] = 'OCR failed'
-                        logger.error(f"OCR failed for {file_path}")
-        except Exception as e:
-            entry['source'] = 'pdf_text'
-            entry['error'] = str(e)
-            logger.error(f"Error extracting text from {file_path}: {e}")
+        _extract_pdf_into_entry(file_path, entry)
     elif file_type == 'image':
         logger.info(f"Extracting text from {file_path}")
         try:
@@ -84,140 +117,38 @@ def extract_single_file_with_metadata(file_path, base_dir=None):
     
     return entry
 
+def _iter_matching_files(folder_path, keywords):
+    """Yield paths under folder_path whose file name contains any of the keywords, in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(folder_path):
+        # os.walk lists directories in filesystem order; sorting them keeps the document order,
+        # and so the serialized prompt, identical between runs over the same directory
+        dirnames.sort()
+        for file in sorted(filenames):
+            if any(keyword in file.lower() for keyword in keywords):
+                yield os.path.join(dirpath, file)
+
+def _extract_files_with_metadata(paths, base_dir):
+    """Extract metadata for each file, spreading the CPU-bound parsing over worker processes."""
+    workers = min(LOAD_DOCUMENTS_NUMBER_OF_THREADS, len(paths))
+    if workers <= 1:
+        return [extract_single_file_with_metadata(path, base_dir) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_single_file_with_metadata, paths, repeat(base_dir)))
+
 def extract_all_relevant_docs_with_metadata(folder_path, base_dir=None):
     """Extract text and metadata from all relevant documents including policy and onboarding forms."""
     if base_dir is None:
         base_dir = folder_path
-    extracted_files = []
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        for file in sorted(filenames):
-            # Include policy documents and onboarding/admission forms
-            relevant_keywords = ['policy', 'onboarding', 'admission', 'cons', 'consultation', 'investigation']
-            if not any(keyword in file.lower() for keyword in relevant_keywords):
-                continue
-            path = os.path.join(dirpath, file)
-            rel_path = os.path.relpath(path, base_dir)
-            file_type = 'pdf' if file.lower().endswith('.pdf') else 'image' if file.lower().endswith((".jpg", ".jpeg", ".png")) else 'other'
-            entry = {
-                'filename': rel_path,
-                'type': file_type,
-                'source': None,
-                'extraction_success': False,
-                'error': None,
-                'text': None
-            }
-            if file_type == 'pdf':
-                try:
-                    logger.info(f"Extracting text from {path}")
-                    with pdfplumber.open(path) as pdf:
-                        extracted = "\n".join([page.extract_text() or "" for page in pdf.pages])
-                        if extracted.strip():
-                            entry['source'] = 'pdf_text'
-                            entry['extraction_success'] = True
-                            entry['text'] = extracted
-                        else:
-                            logger.info(f"Text not found in {path}. Attempting OCR.")
-                            ocr_text = ocr_from_scanned_pdf(path)
-                            if ocr_text:
-                                entry['source'] = 'ocr'
-                                entry['extraction_success'] = True
-                                entry['text'] = ocr_text
-                                logger.info(f"OCR text: {ocr_text}")
-                            else:
-                                entry['source'] = 'ocr'
-                                entry['error'] = 'OCR failed'
-                                logger.error(f"OCR failed for {path}")
-                except Exception as e:
-                    entry['source'] = 'pdf_text'
-                    entry['error'] = str(e)
-                    logger.error(f"Error extracting text from {path}: {e}")
-            elif file_type == 'image':
-                logger.info(f"Extracting text from {path}")
-                try:
-                    ocr_text = ocr_from_image(path)
-                    if ocr_text:
-                        entry['source'] = 'image_ocr'
-                        entry['extraction_success'] = True
-                        entry['text'] = ocr_text
-                        logger.info(f"OCR text: {ocr_text}")
-                    else:
-                        entry['source'] = 'image_ocr'
-                        entry['error'] = 'OCR failed'
-                        logger.error(f"OCR failed for {path}")
-                except Exception as e:
-                    entry['source'] = 'image_ocr'
-                    entry['error'] = str(e)
-                    logger.error(f"Error extracting text from {path}: {e}")
-            else:
-                entry['error'] = 'Unsupported file type'
-            extracted_files.append(entry)
-    return extracted_files
+    # Include policy documents and onboarding/admission forms
+    relevant_keywords = ['policy', 'onboarding', 'admission', 'cons', 'consultation', 'investigation']
+    paths = list(_iter_matching_files(folder_path, relevant_keywords))
+    return _extract_files_with_metadata(paths, base_dir)
 
 def extract_policy_docs_with_metadata(folder_path, base_dir=None):
     if base_dir is None:
         base_dir = folder_path
-    extracted_files = []
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        for file in sorted(filenames):
-            if 'policy' not in file.lower():
-                continue
-            path = os.path.join(dirpath, file)
-            rel_path = os.path.relpath(path, base_dir)
-            file_type = 'pdf' if file.lower().endswith('.pdf') else 'image' if file.lower().endswith((".jpg", ".jpeg", ".png")) else 'other'
-            entry = {
-                'filename': rel_path,
-                'type': file_type,
-                'source': None,
-                'extraction_success': False,
-                'error': None,
-                'text': None
-            }
-            if file_type == 'pdf':
-                try:
-                    logger.info(f"Extracting text from {path}")
-                    with pdfplumber.open(path) as pdf:
-                        extracted = "\n".join([page.extract_text() or "" for page in pdf.pages])
-                        if extracted.strip():
-                            entry['source'] = 'pdf_text'
-                            entry['extraction_success'] = True
-                            entry['text'] = extracted
-                        else:
-                            logger.info(f"Text not found in {path}. Attempting OCR.")
-                            ocr_text = ocr_from_scanned_pdf(path)
-                            if ocr_text:
-                                entry['source'] = 'ocr'
-                                entry['extraction_success'] = True
-                                entry['text'] = ocr_text
-                                logger.info(f"OCR text: {ocr_text}")
-                            else:
-                                entry['source'] = 'ocr'
-                                entry['error'] = 'OCR failed'
-                                logger.error(f"OCR failed for {path}")
-                except Exception as e:
-                    entry['source'] = 'pdf_text'
-                    entry['error'] = str(e)
-                    logger.error(f"Error extracting text from {path}: {e}")
-            elif file_type == 'image':
-                logger.info(f"Extracting text from {path}")
-                try:
-                    ocr_text = ocr_from_image(path)
-                    if ocr_text:
-                        entry['source'] = 'image_ocr'
-                        entry['extraction_success'] = True
-                        entry['text'] = ocr_text
-                        logger.info(f"OCR text: {ocr_text}")
-                    else:
-                        entry['source'] = 'image_ocr'
-                        entry['error'] = 'OCR failed'
-                        logger.error(f"OCR failed for {path}")
-                except Exception as e:
-                    entry['source'] = 'image_ocr'
-                    entry['error'] = str(e)
-                    logger.error(f"Error extracting text from {path}: {e}")
-            else:
-                entry['error'] = 'Unsupported file type'
-            extracted_files.append(entry)
-    return extracted_files
+    paths = list(_iter_matching_files(folder_path, ['policy']))
+    return _extract_files_with_metadata(paths, base_dir)
 
 def build_policy_fields_prompt(metadata_list):
     fields = [
@@ -262,8 +193,26 @@ def build_policy_fields_prompt(metadata_list):
     )
     return prompt
 
+def _collect_validation_results(validation_futures):
+    """Wait for background validations and log each model's outcome."""
+    validation_results = {}
+    for model, future in validation_futures.items():
+        try:
+            validation_report = future.result()
+        except Exception as e:
+            logger.error(f"Failed to validate {model} result: {e}")
+            continue
+        validation_results[model] = validation_report
+        logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
+    return validation_results
+
 def process_single_file_for_llm(file_path, output_root):
     """Process a single file for LLM extraction using prompt_retrieve_text.py."""
+    # Provider SDKs are heavy, so only import them when an LLM pipeline actually runs
+    from openai_extract import extract_fields_with_openai
+    from mistral_extract import extract_fields_with_mistral
+    from gemini_extract import extract_fields_with_gemini
+
     output_root = Path(output_root)
     output_root.mkdir(parents=True, exist_ok=True)
 
@@ -279,7 +228,7 @@ def process_single_file_for_llm(file_path, output_root):
     
     metadata_list = [metadata_entry]
     results = {"openai": {}, "mistral": {}, "gemini": {}}
-    validation_results = {}
+    validation_futures = {}
     
     metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
     file_name = Path(file_path).stem
@@ -308,10 +257,8 @@ def process_single_file_for_llm(file_path, output_root):
                     
                     results[model][file_name] = result_data
                     
-                    # Validate the extraction result
-                    validation_report = validate_extraction_result(result_data)
-                    validation_results[model] = validation_report
-                    logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
+                    # Validate the extraction result in the background
+                    validation_futures[model] = _validation_executor.submit(validate_extraction_result, result_data)
                 else:
                     logger.warning(f"No result from {model}")
                     
@@ -321,6 +268,8 @@ def process_single_file_for_llm(file_path, output_root):
         except Exception as e:
             logger.error(f"Failed {model} extraction for {file_name}: {e}")
 
+    validation_results = _collect_validation_results(validation_futures)
+
     # Write results to their respective files with validation
     for model in ["openai", "mistral", "gemini"]:
         output_file = output_root / f"extracted_summary_{model}.json"
@@ -341,6 +290,11 @@ def process_single_file_for_llm(file_path, output_root):
             logger.error(f"Failed to write {model} output: {e}")
 
 def process_policy_docs_for_llm(docs_root, output_root, patient_dir_name):
+    # Provider SDKs are heavy, so only import them when an LLM pipeline actually runs
+    from openai_extract import extract_fields_with_openai
+    from mistral_extract import extract_fields_with_mistral
+    from gemini_extract import extract_fields_with_gemini
+
     docs_root = Path(docs_root)
     output_root = Path(output_root)
     output_root.mkdir(parents=True, exist_ok=True)
@@ -353,7 +307,7 @@ def process_policy_docs_for_llm(docs_root, output_root, patient_dir_name):
     logger.info(f"Processing directory: {main_dir.name}")
     metadata_list = extract_policy_docs_with_metadata(str(main_dir), str(main_dir))
     results = {"openai": {}, "mistral": {}, "gemini": {}}
-    validation_results = {}
+    validation_futures = {}
     
     if metadata_list:
         metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
@@ -381,10 +335,8 @@ def process_policy_docs_for_llm(docs_root, output_root, patient_dir_name):
                         
                         results[model][main_dir.name] = result_data
                         
-                        # Validate the extraction result
-                        validation_report = validate_extraction_result(result_data)
-                        validation_results[model] = validation_report
-                        logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
+                        # Validate the extraction result in the background
+                        validation_futures[model] = _validation_executor.submit(validate_extraction_result, result_data)
                     else:
                         logger.warning(f"No result from {model}")
                         
@@ -396,13 +348,19 @@ def process_policy_docs_for_llm(docs_root, output_root, patient_dir_name):
     else:
         logger.warning(f"No policy documents found for {main_dir.name}, skipping LLM extraction.")
 
+    validation_results = _collect_validation_results(validation_futures)
+
     # Write results to their respective files with validation
     for model in ["openai", "mistral", "gemini"]:
         output_file = output_root / f"extracted_summary_{model}.json"
         try:
+            validation_dict = None
+            if model in validation_results:
+                validation_dict = validation_results[model].to_dict()
+            
             output_data = {
                 "extraction": results[model],
-                "validation": validation_results.get(model, None)
+                "validation": validation_dict
             }
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump(output_data, f, indent=2, ensure_ascii=False)
@@ -1,25 +1,102 @@
 import sys
 import os
-import json
+import asyncio
+import functools
 import logging
+import orjson
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from loader import extract_single_file_with_metadata, extract_policy_docs_with_metadata
-from prompts import get_openai_policy_prompt, get_mistral_policy_prompt, get_gemini_policy_prompt
-from openai_extract import extract_fields_with_openai
-from mistral_extract import extract_fields_with_mistral
-from gemini_extract import extract_fields_with_gemini
+from llm_dispatch import PROVIDER_REGISTRY, extract_all
+from batch_extract import extract_all_batch
+from directory_scanner import iter_policy_pdfs
 from validation import validate_extraction_result
 from policy_rules import validate_policy_rules
 from accuracy_metrics import AccuracyTracker
-from policy_classifier import classify_policy_document, PolicyType, DocumentCategory
-from policy_report_generator import generate_policy_rule_report
-from llm_config import get_enabled_llm_providers, is_llm_enabled, print_llm_configuration, validate_llm_configuration
+from policy_classifier import classify_policy_document, DocumentCategory
+from pipeline_common import SAMPLE_CLAIM_DATA, classify_documents, pipeline_for_type, parse_extraction_results
+from policy_report_generator import generate_policy_rule_reports
+from llm_config import is_llm_enabled, print_llm_configuration, validate_llm_configuration
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def process_single_file(file_path):
+# Whether ground truth is available is decided once per process; the file is not expected
+# to appear mid-run, so runs without it skip the accuracy block without touching disk
+GROUND_TRUTH_FILE = "data/ground_truth_sample.json"
+_GROUND_TRUTH_EXISTS = os.path.isfile(GROUND_TRUTH_FILE)
+
+# Per-model output files are independent, so their rendering and writes can overlap.
+# The pipelines hand the whole batch to a worker thread so the event loop stays free.
+OUTPUT_WRITE_THREADS = int(os.getenv('OUTPUT_WRITE_THREADS', '8'))
+
+def _save_summary(model, result_json, validation_report):
+    """Write one model's extraction and validation summary; returns the messages to print."""
+    output_data = {
+        "extraction": result_json,
+        # Convert validation report to dict for JSON serialization
+        "validation": validation_report.to_dict() if validation_report else None
+    }
+    # orjson yields UTF-8 bytes directly, so they are written in one call without re-encoding
+    output_file = f"output/extracted_summary_{model}.json"
+    Path(output_file).write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    return [f"✅ Extracted fields and validation saved to {output_file}"]
+
+def _save_policy_rule_reports(model, rule_report, report_name):
+    """Render and write one model's markdown and HTML rule reports; returns the messages to print."""
+    reports = generate_policy_rule_reports(rule_report, ("markdown", "html"))
+    # Each report is encoded once and written with a single binary write
+    report_file = f"output/policy_rule_report_{model}_{report_name}.md"
+    Path(report_file).write_bytes(reports["markdown"].encode('utf-8'))
+    
+    # Also save as HTML for better viewing
+    html_report_file = f"output/policy_rule_report_{model}_{report_name}.html"
+    Path(html_report_file).write_bytes(reports["html"].encode('utf-8'))
+    return [f"✅ Policy rule report saved to {report_file}", f"✅ HTML policy rule report saved to {html_report_file}"]
+
+def _run_per_model(task, arguments, failure_message):
+    """
+    Run task(model, *args) for every model concurrently and print the messages it returns.
+    
+    Args:
+        task: Callable returning a list of messages to print
+        arguments: Dictionary mapping model name to the extra arguments for task
+        failure_message: Log message prefix used when a model's task raises
+    """
+    if not arguments:
+        return
+    with ThreadPoolExecutor(max_workers=min(OUTPUT_WRITE_THREADS, len(arguments))) as executor:
+        futures = {model: executor.submit(task, model, *args) for model, args in arguments.items()}
+        # Collected in model order so the console output stays stable
+        for model, future in futures.items():
+            try:
+                for message in future.result():
+                    print(message)
+            except Exception as e:
+                logger.error(f"{failure_message} for {model}: {e}")
+
+async def extract_with_enabled_providers(metadata_json, batch_custom_id=None):
+    """
+    Run extraction with every enabled provider in the dispatch registry concurrently.
+    
+    Args:
+        metadata_json: Serialized document metadata embedded into each prompt
+        batch_custom_id: When set, batch-capable providers go through their batch APIs
+            with this identifier
+        
+    Returns:
+        Dictionary mapping provider name to its extraction result (None on failure)
+    """
+    providers = [provider for provider in PROVIDER_REGISTRY if is_llm_enabled(provider)]
+    if not providers:
+        raise Exception("No LLM providers are enabled. Please check your configuration.")
+    if batch_custom_id is not None:
+        return await extract_all_batch(metadata_json, batch_custom_id, providers)
+    return await extract_all(metadata_json, providers)
+
+async def process_single_file(file_path):
     """Process a single file for policy extraction using configurable LLM selection."""
     logger.info("Starting single file policy capping extraction pipeline...")
     
@@ -31,6 +108,9 @@ def process_single_file(file_path):
         logger.error("LLM configuration validation failed. Please check your API keys.")
         return
     
+    # Created once per run, before any of the result files are written
+    os.makedirs("output", exist_ok=True)
+    
     try:
         # Step 1: Extract metadata from file
         metadata_entry = extract_single_file_with_metadata(file_path)
@@ -53,60 +133,31 @@ def process_single_file(file_path):
         logger.info(f"Category: {classification_result.category.value}")
         
         # Step 3: Route to appropriate processor based on classification
-        if classification_result.document_type in [PolicyType.HEALTH_INSURANCE, PolicyType.MASTER_POLICY]:
-            logger.info("Using health insurance extraction pipeline")
-        elif classification_result.document_type == PolicyType.LIFE_INSURANCE:
-            logger.info("Using life insurance extraction pipeline")
-        elif classification_result.document_type in [PolicyType.CLAIM_DOCUMENT, PolicyType.HOSPITAL_BILL]:
-            logger.info("Using claim processing pipeline")
-        elif classification_result.document_type == PolicyType.MEDICAL_REPORT:
-            logger.info("Using medical document processing pipeline")
-        else:
-            logger.info("Using general processing pipeline")
+        logger.info(f"Using {pipeline_for_type(classification_result.document_type)}")
         
         metadata_list = [metadata_entry]
-        metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
+        # Serialized once, compact, as UTF-8 bytes; only the LLM prompts read it.
+        # The prompt builders put their static instructions first and this metadata last,
+        # so identical instruction prefixes can be served from the providers' prompt caches.
+        metadata_json = orjson.dumps(metadata_list)
         file_name = os.path.splitext(os.path.basename(file_path))[0]
         
-        # Extract fields using enabled LLMs only
-        extraction_results = {}
-        
-        if is_llm_enabled('openai'):
-            logger.info("Extracting with OpenAI...")
-            extraction_results['openai'] = extract_fields_with_openai(get_openai_policy_prompt(metadata_json))
-        
-        if is_llm_enabled('mistral'):
-            logger.info("Extracting with Mistral...")
-            extraction_results['mistral'] = extract_fields_with_mistral(get_mistral_policy_prompt(metadata_json))
-        
-        if is_llm_enabled('gemini'):
-            logger.info("Extracting with Gemini...")
-            extraction_results['gemini'] = extract_fields_with_gemini(get_gemini_policy_prompt(metadata_json))
-        
-        # Check if any LLMs are enabled
-        if not extraction_results:
-            raise Exception("No LLM providers are enabled. Please check your configuration.")
+        # Extract fields using enabled LLMs only, all providers at once
+        extraction_results = await extract_with_enabled_providers(metadata_json)
         
         logger.info(f"Extraction completed with {len(extraction_results)} LLM provider(s)")
         
+        # Parse each provider's response once; validation, rule checks and accuracy share it
+        parsed_results = parse_extraction_results(extraction_results)
+        
         # Validate extraction results
         logger.info("Validating extraction results...")
         validation_results = {}
         
-        for model, result_json in extraction_results.items():
+        for model in extraction_results:
             try:
-                if result_json and result_json.strip():
-                    # Try to parse JSON if it's a string
-                    if isinstance(result_json, str):
-                        try:
-                            result_data = json.loads(result_json)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Invalid JSON from {model}: {e}")
-                            logger.error(f"Raw response: {result_json[:200]}...")
-                            continue
-                    else:
-                        result_data = result_json
-                    
+                result_data = parsed_results.get(model)
+                if result_data is not None:
                     validation_report = validate_extraction_result(result_data)
                     validation_results[model] = validation_report
                     logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
@@ -115,56 +166,23 @@ def process_single_file(file_path):
             except Exception as e:
                 logger.error(f"Validation failed for {model}: {e}")
         
-        os.makedirs("output", exist_ok=True)
-        
-        # Save results to files with validation
-        for model, result_json in extraction_results.items():
-            # Convert validation report to dict for JSON serialization
-            validation_dict = None
-            if model in validation_results:
-                validation_dict = validation_results[model].to_dict()
-            
-            output_data = {
-                "extraction": result_json,
-                "validation": validation_dict
-            }
-            
-            with open(f"output/extracted_summary_{model}.json", "w") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"✅ Extracted fields and validation saved to output/extracted_summary_{model}.json")
+        # Save results to files with validation, all models at once
+        await asyncio.to_thread(
+            _run_per_model,
+            _save_summary,
+            {model: (result_json, validation_results.get(model)) for model, result_json in extraction_results.items()},
+            "Failed to save extraction summary"
+        )
 
         # Policy Rule Validation
         logger.info("Running policy rule validation...")
         policy_rule_results = {}
         
-        for model, result_json in extraction_results.items():
+        for model in extraction_results:
             try:
-                if result_json and result_json.strip():
-                    # Parse the result data
-                    result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                    
-                    # Create sample claim data for testing (in real scenario, this would come from claim documents)
-                    sample_claim_data = {
-                        "admission_date": "2024-01-15",
-                        "claim_amount": 50000,
-                        "condition": "cardiac",
-                        "hospital_bill": {
-                            "room_rent": 5000,
-                            "icu_charges": 15000,
-                            "procedure": "cardiac surgery",
-                            "procedure_cost": 30000,
-                            "itemized_bill": {
-                                "toiletries": 500,
-                                "food": 1000
-                            }
-                        },
-                        "discharge_summary": {
-                            "procedure": "cardiac surgery",
-                            "is_daycare": False
-                        }
-                    }
-                    
-                    rule_report = validate_policy_rules(result_data, sample_claim_data)
+                result_data = parsed_results.get(model)
+                if result_data is not None:
+                    rule_report = validate_policy_rules(result_data, SAMPLE_CLAIM_DATA)
                     policy_rule_results[model] = rule_report
                     
                     logger.info(f"{model.upper()} Rule Validation - Overall valid: {rule_report.overall_valid}, Risk Level: {rule_report.risk_level}, Total Deductions: {rule_report.total_deductions}")
@@ -189,43 +207,30 @@ def process_single_file(file_path):
         
         # Generate detailed policy rule reports
         print("\n📊 Generating Policy Rule Reports...")
-        for model, rule_report in policy_rule_results.items():
-            try:
-                # Generate markdown report
-                report_content = generate_policy_rule_report(rule_report, format_type="markdown")
-                report_file = f"output/policy_rule_report_{model}_{file_name}.md"
-                os.makedirs("output", exist_ok=True)
-                with open(report_file, 'w', encoding='utf-8') as f:
-                    f.write(report_content)
-                print(f"✅ Policy rule report saved to {report_file}")
-                
-                # Also save as HTML for better viewing
-                html_report_file = f"output/policy_rule_report_{model}_{file_name}.html"
-                generate_policy_rule_report(rule_report, html_report_file, format_type="html")
-                print(f"✅ HTML policy rule report saved to {html_report_file}")
-                
-            except Exception as e:
-                logger.error(f"Failed to generate policy rule report for {model}: {e}")
+        await asyncio.to_thread(
+            _run_per_model,
+            _save_policy_rule_reports,
+            {model: (rule_report, file_name) for model, rule_report in policy_rule_results.items()},
+            "Failed to generate policy rule report"
+        )
 
         # Accuracy Tracking
         logger.info("Running accuracy analysis...")
         try:
             # Load ground truth data if available
-            ground_truth_file = "data/ground_truth_sample.json"
-            if os.path.exists(ground_truth_file):
+            if _GROUND_TRUTH_EXISTS:
                 tracker = AccuracyTracker()
-                ground_truth_data = tracker.load_ground_truth(ground_truth_file)
+                ground_truth_data = tracker.load_ground_truth(GROUND_TRUTH_FILE)
                 
                 if ground_truth_data:
                     # Prepare model results for accuracy analysis
-                    model_results = {}
-                    for model, result_json in extraction_results.items():
-                        if result_json and result_json.strip():
-                            result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                            model_results[model] = {
-                                **result_data,
-                                "processing_time": 30.0  # Estimated processing time
-                            }
+                    model_results = {
+                        model: {
+                            **result_data,
+                            "processing_time": 30.0  # Estimated processing time
+                        }
+                        for model, result_data in parsed_results.items()
+                    }
                     
                     # Generate accuracy report
                     accuracy_report = tracker.compare_models(
@@ -235,7 +240,6 @@ def process_single_file(file_path):
                     )
                     
                     # Save accuracy report
-                    os.makedirs("output", exist_ok=True)
                     tracker.save_accuracy_report(accuracy_report, f"output/accuracy_report_{file_name}.json")
                     
                     # Print accuracy summary
@@ -276,8 +280,15 @@ def process_single_file(file_path):
     except Exception as e:
         logger.error(f"Error in single file policy capping extraction pipeline: {e}")
 
-def process_directory(patient_dir):
-    """Process a directory for policy extraction using configurable LLM selection."""
+async def process_directory(patient_dir, use_batch_api=False):
+    """
+    Process a directory for policy extraction using configurable LLM selection.
+    
+    Args:
+        patient_dir: Directory holding the policy documents
+        use_batch_api: Send OpenAI/Mistral requests through their batch APIs
+            (about half the cost, results arrive when the job finishes)
+    """
     logger.info("Starting directory policy capping extraction pipeline...")
     
     # Print LLM configuration
@@ -288,6 +299,9 @@ def process_directory(patient_dir):
         logger.error("LLM configuration validation failed. Please check your API keys.")
         return
     
+    # Created once per run, before any of the result files are written
+    os.makedirs("output", exist_ok=True)
+    
     try:
         metadata_list = extract_policy_docs_with_metadata(patient_dir, patient_dir)
         if not metadata_list:
@@ -295,85 +309,53 @@ def process_directory(patient_dir):
         
         # Step 1: Classify all documents in the directory
         logger.info("Classifying documents in directory...")
-        classification_results = []
-        
-        for metadata_entry in metadata_list:
-            if metadata_entry.get('extraction_success'):
-                classification_result = classify_policy_document(
-                    filename=metadata_entry.get('filename', ''),
-                    content=metadata_entry.get('text', ''),
-                    metadata=metadata_entry
-                )
-                classification_results.append(classification_result)
-                
-                logger.info(f"  {metadata_entry.get('filename', '')}: {classification_result.document_type.value} (confidence: {classification_result.confidence_score:.2f})")
+        classified_entries = [metadata_entry for metadata_entry in metadata_list if metadata_entry.get('extraction_success')]
+        classification_results = classify_documents(classified_entries)
+        
+        # Logged here, after the workers are done, in document order
+        for metadata_entry, classification_result in zip(classified_entries, classification_results):
+            logger.info(f"  {metadata_entry.get('filename', '')}: {classification_result.document_type.value} (confidence: {classification_result.confidence_score:.2f})")
         
         # Step 2: Determine primary document type for the directory
         if classification_results:
-            # Count document types
-            type_counts = {}
-            for result in classification_results:
-                doc_type = result.document_type.value
-                type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-            
-            # Find most common type
-            primary_type = max(type_counts.keys(), key=lambda k: type_counts[k])
-            logger.info(f"Primary document type for directory: {primary_type}")
+            # Most common document type; ties go to the type seen first
+            primary_type = Counter(result.document_type for result in classification_results).most_common(1)[0][0]
+            logger.info(f"Primary document type for directory: {primary_type.value}")
             
             # Route to appropriate processor
-            if primary_type in ['health_insurance', 'master_policy']:
-                logger.info("Using health insurance extraction pipeline")
-            elif primary_type == 'life_insurance':
-                logger.info("Using life insurance extraction pipeline")
-            elif primary_type in ['claim_document', 'hospital_bill']:
-                logger.info("Using claim processing pipeline")
-            elif primary_type == 'medical_report':
-                logger.info("Using medical document processing pipeline")
-            else:
-                logger.info("Using general processing pipeline")
-        
-        metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
+            logger.info(f"Using {pipeline_for_type(primary_type)}")
+        
+        # Every document already travels in one request per provider; documents whose text
+        # extraction failed carry nothing for the LLM, so they are left out of it. The loader
+        # returns documents in a stable order, so a repeat run over the same directory builds
+        # the same prompt: the instruction prefix hits the providers' prompt caches and the whole
+        # response can come from the local LLM cache
+        llm_metadata = [metadata for metadata in metadata_list if metadata.get('extraction_success', True)]
+        metadata_json = orjson.dumps(llm_metadata)
+        # From here on the documents are only needed in serialized form; dropping the parsed
+        # entries keeps a single copy of the extracted text alive while the providers run
+        del metadata_list, llm_metadata, classified_entries
         logger.info("Policy documents loaded. Beginning extraction...")
         
-        # Extract fields using enabled LLMs only
-        extraction_results = {}
-        
-        if is_llm_enabled('openai'):
-            logger.info("Extracting with OpenAI...")
-            extraction_results['openai'] = extract_fields_with_openai(get_openai_policy_prompt(metadata_json))
-        
-        if is_llm_enabled('mistral'):
-            logger.info("Extracting with Mistral...")
-            extraction_results['mistral'] = extract_fields_with_mistral(get_mistral_policy_prompt(metadata_json))
-        
-        if is_llm_enabled('gemini'):
-            logger.info("Extracting with Gemini...")
-            extraction_results['gemini'] = extract_fields_with_gemini(get_gemini_policy_prompt(metadata_json))
-        
-        # Check if any LLMs are enabled
-        if not extraction_results:
-            raise Exception("No LLM providers are enabled. Please check your configuration.")
+        # Extract fields using enabled LLMs only, all providers at once
+        extraction_results = await extract_with_enabled_providers(
+            metadata_json, batch_custom_id=Path(patient_dir).name if use_batch_api else None
+        )
+        del metadata_json
         
         logger.info(f"Extraction completed with {len(extraction_results)} LLM provider(s)")
         
+        # Parse each provider's response once; validation, rule checks and accuracy share it
+        parsed_results = parse_extraction_results(extraction_results)
+        
         # Validate extraction results
         logger.info("Validating extraction results...")
         validation_results = {}
         
-        for model, result_json in extraction_results.items():
+        for model in extraction_results:
             try:
-                if result_json and result_json.strip():
-                    # Try to parse JSON if it's a string
-                    if isinstance(result_json, str):
-                        try:
-                            result_data = json.loads(result_json)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Invalid JSON from {model}: {e}")
-                            logger.error(f"Raw response: {result_json[:200]}...")
-                            continue
-                    else:
-                        result_data = result_json
-                    
+                result_data = parsed_results.get(model)
+                if result_data is not None:
                     validation_report = validate_extraction_result(result_data)
                     validation_results[model] = validation_report
                     logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
@@ -382,56 +364,23 @@ def process_directory(patient_dir):
             except Exception as e:
                 logger.error(f"Validation failed for {model}: {e}")
         
-        os.makedirs("output", exist_ok=True)
-        
-        # Save results to files with validation
-        for model, result_json in extraction_results.items():
-            # Convert validation report to dict for JSON serialization
-            validation_dict = None
-            if model in validation_results:
-                validation_dict = validation_results[model].to_dict()
-            
-            output_data = {
-                "extraction": result_json,
-                "validation": validation_dict
-            }
-            
-            with open(f"output/extracted_summary_{model}.json", "w") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"✅ Extracted fields and validation saved to output/extracted_summary_{model}.json")
+        # Save results to files with validation, all models at once
+        await asyncio.to_thread(
+            _run_per_model,
+            _save_summary,
+            {model: (result_json, validation_results.get(model)) for model, result_json in extraction_results.items()},
+            "Failed to save extraction summary"
+        )
 
         # Policy Rule Validation
         logger.info("Running policy rule validation...")
         policy_rule_results = {}
         
-        for model, result_json in extraction_results.items():
+        for model in extraction_results:
             try:
-                if result_json and result_json.strip():
-                    # Parse the result data
-                    result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                    
-                    # Create sample claim data for testing (in real scenario, this would come from claim documents)
-                    sample_claim_data = {
-                        "admission_date": "2024-01-15",
-                        "claim_amount": 50000,
-                        "condition": "cardiac",
-                        "hospital_bill": {
-                            "room_rent": 5000,
-                            "icu_charges": 15000,
-                            "procedure": "cardiac surgery",
-                            "procedure_cost": 30000,
-                            "itemized_bill": {
-                                "toiletries": 500,
-                                "food": 1000
-                            }
-                        },
-                        "discharge_summary": {
-                            "procedure": "cardiac surgery",
-                            "is_daycare": False
-                        }
-                    }
-                    
-                    rule_report = validate_policy_rules(result_data, sample_claim_data)
+                result_data = parsed_results.get(model)
+                if result_data is not None:
+                    rule_report = validate_policy_rules(result_data, SAMPLE_CLAIM_DATA)
                     policy_rule_results[model] = rule_report
                     
                     logger.info(f"{model.upper()} Rule Validation - Overall valid: {rule_report.overall_valid}, Risk Level: {rule_report.risk_level}, Total Deductions: {rule_report.total_deductions}")
@@ -456,46 +405,31 @@ def process_directory(patient_dir):
         
         # Generate detailed policy rule reports
         print("\n📊 Generating Policy Rule Reports...")
-        for model, rule_report in policy_rule_results.items():
-            try:
-                # Get directory name for accuracy report
-                main_dir = Path(patient_dir)
-                
-                # Generate markdown report
-                report_content = generate_policy_rule_report(rule_report, format_type="markdown")
-                report_file = f"output/policy_rule_report_{model}_{main_dir.name}.md"
-                os.makedirs("output", exist_ok=True)
-                with open(report_file, 'w', encoding='utf-8') as f:
-                    f.write(report_content)
-                print(f"✅ Policy rule report saved to {report_file}")
-                
-                # Also save as HTML for better viewing
-                html_report_file = f"output/policy_rule_report_{model}_{main_dir.name}.html"
-                generate_policy_rule_report(rule_report, html_report_file, format_type="html")
-                print(f"✅ HTML policy rule report saved to {html_report_file}")
-                
-            except Exception as e:
-                logger.error(f"Failed to generate policy rule report for {model}: {e}")
+        report_name = Path(patient_dir).name
+        await asyncio.to_thread(
+            _run_per_model,
+            _save_policy_rule_reports,
+            {model: (rule_report, report_name) for model, rule_report in policy_rule_results.items()},
+            "Failed to generate policy rule report"
+        )
 
         # Accuracy Tracking
         logger.info("Running accuracy analysis...")
         try:
             # Load ground truth data if available
-            ground_truth_file = "data/ground_truth_sample.json"
-            if os.path.exists(ground_truth_file):
+            if _GROUND_TRUTH_EXISTS:
                 tracker = AccuracyTracker()
-                ground_truth_data = tracker.load_ground_truth(ground_truth_file)
+                ground_truth_data = tracker.load_ground_truth(GROUND_TRUTH_FILE)
                 
                 if ground_truth_data:
                     # Prepare model results for accuracy analysis
-                    model_results = {}
-                    for model, result_json in extraction_results.items():
-                        if result_json and result_json.strip():
-                            result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                            model_results[model] = {
-                                **result_data,
-                                "processing_time": 30.0  # Estimated processing time
-                            }
+                    model_results = {
+                        model: {
+                            **result_data,
+                            "processing_time": 30.0  # Estimated processing time
+                        }
+                        for model, result_data in parsed_results.items()
+                    }
                     
                     # Get directory name for accuracy report
                     main_dir = Path(patient_dir)
@@ -508,7 +442,6 @@ def process_directory(patient_dir):
                     )
                     
                     # Save accuracy report
-                    os.makedirs("output", exist_ok=True)
                     tracker.save_accuracy_report(accuracy_report, f"output/accuracy_report_{main_dir.name}.json")
                     
                     # Print accuracy summary
@@ -536,25 +469,28 @@ def process_directory(patient_dir):
     except Exception as e:
         logger.error(f"Error in directory policy capping extraction pipeline: {e}")
 
+@functools.lru_cache(maxsize=1)
 def find_first_policy_file():
-    """Find the first available policy file in the data directory."""
-    for root, dirs, files in os.walk("data"):
-        for file in files:
-            if 'policy' in file.lower() and file.endswith('.pdf'):
-                return os.path.join(root, file)
-    return None
+    """Find the first available policy file in the data directory (looked up once per process)."""
+    # Lazy scandir walk that stops at the first match instead of listing the whole tree
+    return next(iter_policy_pdfs("data"), None)
 
 if __name__ == "__main__":
     # Default file for Docker environment
     default_file = "./data/Master Policies/master policy-care classic mediclaim policy.pdf"
     
+    # --batch routes directory runs through the provider batch APIs (cheaper, not interactive)
+    use_batch_api = "--batch" in sys.argv
+    if use_batch_api:
+        sys.argv.remove("--batch")
+    
     if len(sys.argv) == 1:
         # No arguments provided - use default single file processing for Docker
         logger.info("No arguments provided. Using default single file processing for Docker environment.")
         
         # Try the default file first
         if os.path.exists(default_file):
-            process_single_file(default_file)
+            asyncio.run(process_single_file(default_file))
         else:
             # Try to find any available policy file
             logger.info("Default file not found. Searching for available policy files...")
@@ -562,7 +498,7 @@ if __name__ == "__main__":
             
             if found_file:
                 logger.info(f"Found policy file: {found_file}")
-                process_single_file(found_file)
+                asyncio.run(process_single_file(found_file))
             else:
                 logger.error("No policy files found. Please provide a file path.")
                 print("Usage: python main.py --file <file_path>")
@@ -574,7 +510,7 @@ if __name__ == "__main__":
         # Single argument - treat as directory path (legacy mode)
         directory_path = sys.argv[1]
         if os.path.isdir(directory_path):
-            process_directory(directory_path)
+            asyncio.run(process_directory(directory_path, use_batch_api))
         else:
             logger.error(f"Directory not found: {directory_path}")
             sys.exit(1)
@@ -584,14 +520,14 @@ if __name__ == "__main__":
         if sys.argv[1] == "--file":
             file_path = sys.argv[2]
             if os.path.isfile(file_path):
-                process_single_file(file_path)
+                asyncio.run(process_single_file(file_path))
             else:
                 logger.error(f"File not found: {file_path}")
                 sys.exit(1)
         elif sys.argv[1] == "--dir":
             directory_path = sys.argv[2]
             if os.path.isdir(directory_path):
-                process_directory(directory_path)
+                asyncio.run(process_directory(directory_path, use_batch_api))
             else:
                 logger.error(f"Directory not found: {directory_path}")
                 sys.exit(1)
@@ -606,4 +542,5 @@ if __name__ == "__main__":
         print("Usage: python main.py --file <file_path>")
         print("       python main.py --dir <directory_path>")
         print("       python main.py <directory_path> # legacy mode")
+        print("       add --batch to process a directory through the provider batch APIs")
         sys.exit(1) 
\ No newline at end of file
@@ -1,27 +1,218 @@
 import sys
 import os
-import json
+import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
+import orjson
+from collections import Counter
 from pathlib import Path
-from loader import extract_single_file_with_metadata, extract_policy_docs_with_metadata
-from prompts import get_openai_policy_prompt, get_mistral_policy_prompt, get_gemini_policy_prompt
-from openai_extract import extract_fields_with_openai
-from mistral_extract import extract_fields_with_mistral
-from gemini_extract import extract_fields_with_gemini
+from llm_dispatch import ALL_PROVIDERS, extract_all
+from batch_extract import extract_all_batch
+from directory_scanner import iter_policy_pdfs
 from validation import validate_extraction_result
 from policy_rules import validate_policy_rules
-from accuracy_metrics import AccuracyTracker
-from policy_classifier import classify_policy_document, PolicyType, DocumentCategory
+from accuracy_metrics import AccuracyTracker, load_ground_truth_cached
+from policy_classifier import classify_policy_document, DocumentCategory
+from pipeline_common import SAMPLE_CLAIM_DATA, classify_documents, pipeline_for_type, is_known_type, parse_extraction_results
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def process_single_file(file_path):
+def _start_queue_logging():
+    """Route root log records through a queue so a background listener does the stream writes."""
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain whatever is still queued before the interpreter exits
+    atexit.register(listener.stop)
+    return listener
+
+def _write_bytes(path, data):
+    """Write a bytes payload with raw os-level calls, skipping the buffered file object."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    # Atomic rename so readers never see a half-written result file
+    os.replace(tmp_path, path)
+
+def _persist_results(extraction_results, validation_results):
+    """Save each model's extraction together with its validation report."""
+    os.makedirs("output", exist_ok=True)
+    for model, result_json in extraction_results.items():
+        # Convert validation report to dict for JSON serialization
+        validation_dict = None
+        if model in validation_results:
+            validation_dict = validation_results[model].to_dict()
+        
+        output_data = {
+            "extraction": result_json,
+            "validation": validation_dict
+        }
+        
+        # orjson yields UTF-8 bytes directly, so write them without re-encoding
+        output_file = f"output/extracted_summary_{model}.json"
+        _write_bytes(output_file, orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        logger.info(f"✅ Extracted fields and validation saved to {output_file}")
+
+GROUND_TRUTH_FILE = "data/ground_truth_sample.json"
+
+async def _run_pipeline(metadata_json, report_name, batch_custom_id=None):
+    """
+    Extract, validate, rule-check and score policy fields for serialized documents.
+    
+    Args:
+        metadata_json: Document metadata serialized once with orjson
+        report_name: Name used in the accuracy report file name
+        batch_custom_id: When set, OpenAI/Mistral requests go through their batch
+            APIs with this identifier
+        
+    Returns:
+        Dictionary mapping provider name to its raw extraction result
+    """
+    # Extract fields using different LLMs concurrently
+    if batch_custom_id is not None:
+        extraction_results = await extract_all_batch(metadata_json, batch_custom_id, ALL_PROVIDERS)
+    else:
+        extraction_results = await extract_all(metadata_json)
+    del metadata_json
+    
+    # Parse each provider's response once; validation, rule checks and accuracy share it
+    parsed_results = parse_extraction_results(extraction_results)
+    
+    # Validate extraction results
+    logger.info("Validating extraction results...")
+    validation_results = {}
+    
+    for model in extraction_results:
+        try:
+            result_data = parsed_results.get(model)
+            if result_data is not None:
+                validation_report = validate_extraction_result(result_data)
+                validation_results[model] = validation_report
+                logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
+            else:
+                logger.warning(f"No result from {model}")
+        except Exception as e:
+            logger.error(f"Validation failed for {model}: {e}")
+    
+    # Save results to files with validation
+    _persist_results(extraction_results, validation_results)
+
+    # Policy Rule Validation
+    logger.info("Running policy rule validation...")
+    policy_rule_results = {}
+    
+    for model in extraction_results:
+        try:
+            result_data = parsed_results.get(model)
+            if result_data is not None:
+                rule_report = validate_policy_rules(result_data, SAMPLE_CLAIM_DATA)
+                policy_rule_results[model] = rule_report
+                
+                logger.info(f"{model.upper()} Rule Validation - Overall valid: {rule_report.overall_valid}, Risk Level: {rule_report.risk_level}, Total Deductions: {rule_report.total_deductions}")
+            else:
+                logger.warning(f"No result data available for {model} rule validation")
+        except Exception as e:
+            logger.error(f"Policy rule validation failed for {model}: {e}")
+    
+    # Print validation and policy rule summaries in one write rather than one print per line
+    summary_lines = ["\n📊 Validation Summary:"]
+    for model, report in validation_results.items():
+        summary_lines.append(f"  {model.upper()}: Valid={report.overall_valid}, Confidence={report.overall_confidence:.2f}")
+        if report.recommendations:
+            summary_lines.append("    Recommendations: " + ", ".join(report.recommendations[:3]))
+    
+    summary_lines.append("\n📋 Policy Rule Summary:")
+    for model, rule_report in policy_rule_results.items():
+        summary_lines.append(f"  {model.upper()}: Valid={rule_report.overall_valid}, Risk={rule_report.risk_level}, Deductions={rule_report.total_deductions}")
+        if rule_report.recommendations:
+            summary_lines.append("    Rule Recommendations: " + ", ".join(rule_report.recommendations[:3]))
+    sys.stdout.write("\n".join(summary_lines) + "\n")
+
+    # Accuracy Tracking
+    logger.info("Running accuracy analysis...")
+    try:
+        # Load ground truth data if available; the stat doubles as the existence check
+        try:
+            ground_truth_mtime = os.path.getmtime(GROUND_TRUTH_FILE)
+        except OSError:
+            ground_truth_mtime = None
+        if ground_truth_mtime is not None:
+            tracker = AccuracyTracker()
+            ground_truth_data = load_ground_truth_cached(GROUND_TRUTH_FILE, ground_truth_mtime)
+            
+            if ground_truth_data:
+                # Prepare model results for accuracy analysis
+                model_results = {
+                    model: {
+                        **result_data,
+                        "processing_time": 30.0  # Estimated processing time
+                    }
+                    for model, result_data in parsed_results.items()
+                }
+                
+                # Generate accuracy report
+                accuracy_report = tracker.compare_models(
+                    model_results, 
+                    ground_truth_data.get("ground_truth_values", {}),
+                    f"policy_extraction_{report_name}"
+                )
+                
+                # Save accuracy report
+                os.makedirs("output", exist_ok=True)
+                tracker.save_accuracy_report(accuracy_report, f"output/accuracy_report_{report_name}.json")
+                
+                # Print accuracy summary in one write rather than one print per line
+                summary_lines = [
+                    "\n📊 Accuracy Analysis:",
+                    f"  Best Model: {accuracy_report.overall_best_model} ({accuracy_report.overall_accuracy:.1f}% accuracy)",
+                ]
+                summary_lines.extend(
+                    f"  {model_name.upper()}: {model_accuracy.accuracy_percentage:.1f}% accuracy, {model_accuracy.average_confidence:.2f} confidence"
+                    for model_name, model_accuracy in accuracy_report.model_comparison.items()
+                )
+                if accuracy_report.recommendations:
+                    summary_lines.append("  Recommendations: " + ", ".join(accuracy_report.recommendations[:3]))
+                sys.stdout.write("\n".join(summary_lines) + "\n")
+                
+                logger.info(f"Accuracy report saved to output/accuracy_report_{report_name}.json")
+            else:
+                logger.warning("No ground truth data available for accuracy analysis")
+        else:
+            logger.info("Ground truth file not found, skipping accuracy analysis")
+    except Exception as e:
+        logger.error(f"Accuracy analysis failed: {e}")
+    
+    return extraction_results
+
+def _print_extraction_complete(extraction_results):
+    print("\n✅ Extraction complete!")
+    # Full payloads can be several MB; only format them when debug output is requested
+    if logger.isEnabledFor(logging.DEBUG):
+        for model, result in extraction_results.items():
+            logger.debug(f"{model.upper()} Results: {result}")
+
+async def process_single_file(file_path):
     """Process a single file for policy extraction using prompt_retrieve_text.py."""
     logger.info("Starting single file policy capping extraction pipeline...")
     
     try:
+        # The loader pulls in the PDF/OCR stack, so it is only imported once a document is processed
+        from loader import extract_single_file_with_metadata
+        
         # Step 1: Extract metadata from file
         metadata_entry = extract_single_file_with_metadata(file_path)
         if not metadata_entry:
@@ -43,421 +234,105 @@ def process_single_file(file_path):
         logger.info(f"Category: {classification_result.category.value}")
         
         # Step 3: Route to appropriate processor based on classification
-        if classification_result.document_type in [PolicyType.HEALTH_INSURANCE, PolicyType.MASTER_POLICY]:
-            logger.info("Using health insurance extraction pipeline")
-            # Continue with policy extraction
-        elif classification_result.document_type == PolicyType.LIFE_INSURANCE:
-            logger.info("Using life insurance extraction pipeline")
-            # TODO: Implement life insurance specific extraction
-        elif classification_result.document_type in [PolicyType.CLAIM_DOCUMENT, PolicyType.HOSPITAL_BILL]:
-            logger.info("Using claim processing pipeline")
-            # TODO: Implement claim processing
-        elif classification_result.document_type == PolicyType.MEDICAL_REPORT:
-            logger.info("Using medical document processing pipeline")
-            # TODO: Implement medical document processing
-        else:
+        # TODO: Implement life insurance, claim and medical document specific extraction
+        if not is_known_type(classification_result.document_type):
             logger.warning(f"Unknown document type: {classification_result.document_type.value}")
-            logger.info("Using general processing pipeline")
+        logger.info(f"Using {pipeline_for_type(classification_result.document_type)}")
         
-        metadata_list = [metadata_entry]
-        metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
+        # Serialized exactly once and compact (no indent) since only the LLMs read it;
+        # the parsed entry is dropped so its text is not held for the provider calls
+        metadata_json = orjson.dumps([metadata_entry])
+        del metadata_entry
         file_name = os.path.splitext(os.path.basename(file_path))[0]
         
-        # Extract fields using different LLMs
-        result_json_openai = extract_fields_with_openai(get_openai_policy_prompt(metadata_json))
-        result_json_mistral = extract_fields_with_mistral(get_mistral_policy_prompt(metadata_json))
-        result_json_gemini = extract_fields_with_gemini(get_gemini_policy_prompt(metadata_json))
-        
-        # Validate extraction results
-        logger.info("Validating extraction results...")
-        validation_results = {}
-        
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            try:
-                if result_json and result_json.strip():
-                    # Try to parse JSON if it's a string
-                    if isinstance(result_json, str):
-                        try:
-                            result_data = json.loads(result_json)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Invalid JSON from {model}: {e}")
-                            logger.error(f"Raw response: {result_json[:200]}...")
-                            continue
-                    else:
-                        result_data = result_json
-                    
-                    validation_report = validate_extraction_result(result_data)
-                    validation_results[model] = validation_report
-                    logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
-                else:
-                    logger.warning(f"No result from {model}")
-            except Exception as e:
-                logger.error(f"Validation failed for {model}: {e}")
-        
-        os.makedirs("output", exist_ok=True)
-        
-        # Save results to files with validation
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            # Convert validation report to dict for JSON serialization
-            validation_dict = None
-            if model in validation_results:
-                validation_dict = validation_results[model].to_dict()
-            
-            output_data = {
-                "extraction": result_json,
-                "validation": validation_dict
-            }
-            
-            with open(f"output/extracted_summary_{model}.json", "w") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"✅ Extracted fields and validation saved to output/extracted_summary_{model}.json")
+        # Step 4: Extract, validate and score using LLMs
+        extraction_results = await _run_pipeline(metadata_json, file_name)
 
-        # Policy Rule Validation
-        logger.info("Running policy rule validation...")
-        policy_rule_results = {}
-        
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            try:
-                if result_json and result_json.strip():
-                    # Parse the result data
-                    result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                    
-                    # Create sample claim data for testing (in real scenario, this would come from claim documents)
-                    sample_claim_data = {
-                        "admission_date": "2024-01-15",
-                        "claim_amount": 50000,
-                        "condition": "cardiac",
-                        "hospital_bill": {
-                            "room_rent": 5000,
-                            "icu_charges": 15000,
-                            "procedure": "cardiac surgery",
-                            "procedure_cost": 30000,
-                            "itemized_bill": {
-                                "toiletries": 500,
-                                "food": 1000
-                            }
-                        },
-                        "discharge_summary": {
-                            "procedure": "cardiac surgery",
-                            "is_daycare": False
-                        }
-                    }
-                    
-                    rule_report = validate_policy_rules(result_data, sample_claim_data)
-                    policy_rule_results[model] = rule_report
-                    
-                    logger.info(f"{model.upper()} Rule Validation - Overall valid: {rule_report.overall_valid}, Risk Level: {rule_report.risk_level}, Total Deductions: {rule_report.total_deductions}")
-                else:
-                    logger.warning(f"No result data available for {model} rule validation")
-            except Exception as e:
-                logger.error(f"Policy rule validation failed for {model}: {e}")
-        
-        # Print validation summary
-        print("\n📊 Validation Summary:")
-        for model, report in validation_results.items():
-            print(f"  {model.upper()}: Valid={report.overall_valid}, Confidence={report.overall_confidence:.2f}")
-            if report.recommendations:
-                print(f"    Recommendations: {', '.join(report.recommendations[:3])}")
-        
-        # Print policy rule summary
-        print("\n📋 Policy Rule Summary:")
-        for model, rule_report in policy_rule_results.items():
-            print(f"  {model.upper()}: Valid={rule_report.overall_valid}, Risk={rule_report.risk_level}, Deductions={rule_report.total_deductions}")
-            if rule_report.recommendations:
-                print(f"    Rule Recommendations: {', '.join(rule_report.recommendations[:3])}")
-
-        # Accuracy Tracking
-        logger.info("Running accuracy analysis...")
-        try:
-            # Load ground truth data if available
-            ground_truth_file = "data/ground_truth_sample.json"
-            if os.path.exists(ground_truth_file):
-                tracker = AccuracyTracker()
-                ground_truth_data = tracker.load_ground_truth(ground_truth_file)
-                
-                if ground_truth_data:
-                    # Prepare model results for accuracy analysis
-                    model_results = {}
-                    for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-                        if result_json and result_json.strip():
-                            result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                            model_results[model] = {
-                                **result_data,
-                                "processing_time": 30.0  # Estimated processing time
-                            }
-                    
-                    # Generate accuracy report
-                    accuracy_report = tracker.compare_models(
-                        model_results, 
-                        ground_truth_data.get("ground_truth_values", {}),
-                        f"policy_extraction_{file_name}"
-                    )
-                    
-                    # Save accuracy report
-                    os.makedirs("output", exist_ok=True)
-                    tracker.save_accuracy_report(accuracy_report, f"output/accuracy_report_{file_name}.json")
-                    
-                    # Print accuracy summary
-                    print("\n📊 Accuracy Analysis:")
-                    print(f"  Best Model: {accuracy_report.overall_best_model} ({accuracy_report.overall_accuracy:.1f}% accuracy)")
-                    for model_name, model_accuracy in accuracy_report.model_comparison.items():
-                        print(f"  {model_name.upper()}: {model_accuracy.accuracy_percentage:.1f}% accuracy, {model_accuracy.average_confidence:.2f} confidence")
-                    
-                    if accuracy_report.recommendations:
-                        print(f"  Recommendations: {', '.join(accuracy_report.recommendations[:3])}")
-                    
-                    logger.info(f"Accuracy report saved to output/accuracy_report_{file_name}.json")
-                else:
-                    logger.warning("No ground truth data available for accuracy analysis")
-            else:
-                logger.info("Ground truth file not found, skipping accuracy analysis")
-        except Exception as e:
-            logger.error(f"Accuracy analysis failed: {e}")
-
-        # Print classification summary
-        print("\n📋 Document Classification Summary:")
-        print(f"  Document Type: {classification_result.document_type.value}")
-        print(f"  Category: {classification_result.category.value}")
-        print(f"  Confidence: {classification_result.confidence_score:.2f}")
+        # Print classification summary in one write rather than one print per line
+        summary_lines = [
+            "\n📋 Document Classification Summary:",
+            f"  Document Type: {classification_result.document_type.value}",
+            f"  Category: {classification_result.category.value}",
+            f"  Confidence: {classification_result.confidence_score:.2f}",
+        ]
         if classification_result.policy_number:
-            print(f"  Policy Number: {classification_result.policy_number}")
+            summary_lines.append(f"  Policy Number: {classification_result.policy_number}")
         if classification_result.policy_version:
-            print(f"  Policy Version: {classification_result.policy_version}")
-        
+            summary_lines.append(f"  Policy Version: {classification_result.policy_version}")
         if classification_result.recommendations:
-            print(f"  Recommendations: {', '.join(classification_result.recommendations[:2])}")
+            summary_lines.append("  Recommendations: " + ", ".join(classification_result.recommendations[:2]))
+        sys.stdout.write("\n".join(summary_lines) + "\n")
 
-        # Print results
-        print("\n✅ Extraction complete!")
-        print("OpenAI Results:", result_json_openai)
-        print("Mistral Results:", result_json_mistral)
-        print("Gemini Results:", result_json_gemini)
+        _print_extraction_complete(extraction_results)
 
     except Exception as e:
         logger.error(f"Error in single file policy capping extraction pipeline: {e}")
 
-def process_directory(patient_dir):
-    """Process a directory for policy extraction using prompts.py."""
+async def process_directory(patient_dir, use_batch_api=False):
+    """
+    Process a directory for policy extraction using prompts.py.
+    
+    Args:
+        patient_dir: Directory holding the policy documents
+        use_batch_api: Send OpenAI/Mistral requests through their batch APIs
+            (about half the cost, results arrive when the job finishes)
+    """
     logger.info("Starting directory policy capping extraction pipeline...")
     
     try:
+        # The loader pulls in the PDF/OCR stack, so it is only imported once a document is processed
+        from loader import extract_policy_docs_with_metadata
+        
         metadata_list = extract_policy_docs_with_metadata(patient_dir, patient_dir)
+        # Only send documents whose text was actually extracted to the LLMs
+        metadata_list = [entry for entry in metadata_list if entry['extraction_success']]
         if not metadata_list:
             raise Exception("No policy documents found in the specified directory.")
         
         # Step 1: Classify all documents in the directory
         logger.info("Classifying documents in directory...")
-        classification_results = []
+        classification_results = classify_documents(metadata_list)
         
-        for metadata_entry in metadata_list:
-            if metadata_entry.get('extraction_success'):
-                classification_result = classify_policy_document(
-                    filename=metadata_entry.get('filename', ''),
-                    content=metadata_entry.get('text', ''),
-                    metadata=metadata_entry
-                )
-                classification_results.append(classification_result)
-                
-                logger.info(f"  {metadata_entry.get('filename', '')}: {classification_result.document_type.value} (confidence: {classification_result.confidence_score:.2f})")
+        # Logged here, after the workers are done, in document order
+        for metadata_entry, classification_result in zip(metadata_list, classification_results):
+            logger.info(f"  {metadata_entry.get('filename', '')}: {classification_result.document_type.value} (confidence: {classification_result.confidence_score:.2f})")
         
         # Step 2: Determine primary document type for the directory
         if classification_results:
-            # Count document types
-            type_counts = {}
-            for result in classification_results:
-                doc_type = result.document_type.value
-                type_counts[doc_type] = type_counts.get(doc_type, 0) + 1
-            
-            # Find most common type
-            primary_type = max(type_counts.keys(), key=lambda k: type_counts[k])
-            logger.info(f"Primary document type for directory: {primary_type}")
+            # Most common document type; ties go to the type seen first
+            primary_type = Counter(result.document_type for result in classification_results).most_common(1)[0][0]
+            logger.info(f"Primary document type for directory: {primary_type.value}")
             
             # Route to appropriate processor
-            if primary_type in ['health_insurance', 'master_policy']:
-                logger.info("Using health insurance extraction pipeline")
-            elif primary_type == 'life_insurance':
-                logger.info("Using life insurance extraction pipeline")
-            elif primary_type in ['claim_document', 'hospital_bill']:
-                logger.info("Using claim processing pipeline")
-            elif primary_type == 'medical_report':
-                logger.info("Using medical document processing pipeline")
-            else:
-                logger.info("Using general processing pipeline")
+            logger.info(f"Using {pipeline_for_type(primary_type)}")
         
-        metadata_json = json.dumps(metadata_list, indent=2, ensure_ascii=False)
+        # Serialized exactly once and compact (no indent) since only the LLMs read it;
+        # the parsed entries are dropped so their text is not held for the provider calls
+        metadata_json = orjson.dumps(metadata_list)
+        del metadata_list, metadata_entry
         logger.info("Policy documents loaded. Beginning extraction...")
         
-        result_json_openai = extract_fields_with_openai(get_openai_policy_prompt(metadata_json))
-        result_json_mistral = extract_fields_with_mistral(get_mistral_policy_prompt(metadata_json))
-        result_json_gemini = extract_fields_with_gemini(get_gemini_policy_prompt(metadata_json))
-        
-        # Validate extraction results
-        logger.info("Validating extraction results...")
-        validation_results = {}
-        
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            try:
-                if result_json and result_json.strip():
-                    # Try to parse JSON if it's a string
-                    if isinstance(result_json, str):
-                        try:
-                            result_data = json.loads(result_json)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Invalid JSON from {model}: {e}")
-                            logger.error(f"Raw response: {result_json[:200]}...")
-                            continue
-                    else:
-                        result_data = result_json
-                    
-                    validation_report = validate_extraction_result(result_data)
-                    validation_results[model] = validation_report
-                    logger.info(f"{model.upper()} validation - Overall valid: {validation_report.overall_valid}, Confidence: {validation_report.overall_confidence:.2f}")
-                else:
-                    logger.warning(f"No result from {model}")
-            except Exception as e:
-                logger.error(f"Validation failed for {model}: {e}")
-        
-        os.makedirs("output", exist_ok=True)
-        
-        # Save results to files with validation
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            # Convert validation report to dict for JSON serialization
-            validation_dict = None
-            if model in validation_results:
-                validation_dict = validation_results[model].to_dict()
-            
-            output_data = {
-                "extraction": result_json,
-                "validation": validation_dict
-            }
-            
-            with open(f"output/extracted_summary_{model}.json", "w") as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            print(f"✅ Extracted fields and validation saved to output/extracted_summary_{model}.json")
+        # Step 3: Extract, validate and score using LLMs
+        dir_name = Path(patient_dir).name
+        extraction_results = await _run_pipeline(metadata_json, dir_name, batch_custom_id=dir_name if use_batch_api else None)
 
-        # Policy Rule Validation
-        logger.info("Running policy rule validation...")
-        policy_rule_results = {}
-        
-        for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-            try:
-                if result_json and result_json.strip():
-                    # Parse the result data
-                    result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                    
-                    # Create sample claim data for testing (in real scenario, this would come from claim documents)
-                    sample_claim_data = {
-                        "admission_date": "2024-01-15",
-                        "claim_amount": 50000,
-                        "condition": "cardiac",
-                        "hospital_bill": {
-                            "room_rent": 5000,
-                            "icu_charges": 15000,
-                            "procedure": "cardiac surgery",
-                            "procedure_cost": 30000,
-                            "itemized_bill": {
-                                "toiletries": 500,
-                                "food": 1000
-                            }
-                        },
-                        "discharge_summary": {
-                            "procedure": "cardiac surgery",
-                            "is_daycare": False
-                        }
-                    }
-                    
-                    rule_report = validate_policy_rules(result_data, sample_claim_data)
-                    policy_rule_results[model] = rule_report
-                    
-                    logger.info(f"{model.upper()} Rule Validation - Overall valid: {rule_report.overall_valid}, Risk Level: {rule_report.risk_level}, Total Deductions: {rule_report.total_deductions}")
-                else:
-                    logger.warning(f"No result data available for {model} rule validation")
-            except Exception as e:
-                logger.error(f"Policy rule validation failed for {model}: {e}")
-        
-        # Print validation summary
-        print("\n📊 Validation Summary:")
-        for model, report in validation_results.items():
-            print(f"  {model.upper()}: Valid={report.overall_valid}, Confidence={report.overall_confidence:.2f}")
-            if report.recommendations:
-                print(f"    Recommendations: {', '.join(report.recommendations[:3])}")
-        
-        # Print policy rule summary
-        print("\n📋 Policy Rule Summary:")
-        for model, rule_report in policy_rule_results.items():
-            print(f"  {model.upper()}: Valid={rule_report.overall_valid}, Risk={rule_report.risk_level}, Deductions={rule_report.total_deductions}")
-            if rule_report.recommendations:
-                print(f"    Rule Recommendations: {', '.join(rule_report.recommendations[:3])}")
-
-        # Accuracy Tracking
-        logger.info("Running accuracy analysis...")
-        try:
-            # Load ground truth data if available
-            ground_truth_file = "data/ground_truth_sample.json"
-            if os.path.exists(ground_truth_file):
-                tracker = AccuracyTracker()
-                ground_truth_data = tracker.load_ground_truth(ground_truth_file)
-                
-                if ground_truth_data:
-                    # Prepare model results for accuracy analysis
-                    model_results = {}
-                    for model, result_json in [("openai", result_json_openai), ("mistral", result_json_mistral), ("gemini", result_json_gemini)]:
-                        if result_json and result_json.strip():
-                            result_data = json.loads(result_json) if isinstance(result_json, str) else result_json
-                            model_results[model] = {
-                                **result_data,
-                                "processing_time": 30.0  # Estimated processing time
-                            }
-                    
-                    # Get directory name for accuracy report
-                    main_dir = Path(patient_dir)
-                    
-                    # Generate accuracy report
-                    accuracy_report = tracker.compare_models(
-                        model_results, 
-                        ground_truth_data.get("ground_truth_values", {}),
-                        f"policy_extraction_{main_dir.name}"
-                    )
-                    
-                    # Save accuracy report
-                    os.makedirs("output", exist_ok=True)
-                    tracker.save_accuracy_report(accuracy_report, f"output/accuracy_report_{main_dir.name}.json")
-                    
-                    # Print accuracy summary
-                    print("\n📊 Accuracy Analysis:")
-                    print(f"  Best Model: {accuracy_report.overall_best_model} ({accuracy_report.overall_accuracy:.1f}% accuracy)")
-                    for model_name, model_accuracy in accuracy_report.model_comparison.items():
-                        print(f"  {model_name.upper()}: {model_accuracy.accuracy_percentage:.1f}% accuracy, {model_accuracy.average_confidence:.2f} confidence")
-                    
-                    if accuracy_report.recommendations:
-                        print(f"  Recommendations: {', '.join(accuracy_report.recommendations[:3])}")
-                    
-                    logger.info(f"Accuracy report saved to output/accuracy_report_{main_dir.name}.json")
-                else:
-                    logger.warning("No ground truth data available for accuracy analysis")
-            else:
-                logger.info("Ground truth file not found, skipping accuracy analysis")
-        except Exception as e:
-            logger.error(f"Accuracy analysis failed: {e}")
-
-        # Print results
-        print("\n✅ Extraction complete!")
-        print("OpenAI Results:", result_json_openai)
-        print("Mistral Results:", result_json_mistral)
-        print("Gemini Results:", result_json_gemini)
+        _print_extraction_complete(extraction_results)
 
     except Exception as e:
         logger.error(f"Error in directory policy capping extraction pipeline: {e}")
 
 def find_first_policy_file():
     """Find the first available policy file in the data directory."""
-    for root, dirs, files in os.walk("data"):
-        for file in files:
-            if 'policy' in file.lower() and file.endswith('.pdf'):
-                return os.path.join(root, file)
-    return None
+    return next(iter_policy_pdfs("data"), None)
 
 if __name__ == "__main__":
+    _start_queue_logging()
+    
+    # --batch routes directory runs through the provider batch APIs (cheaper, not interactive)
+    use_batch_api = "--batch" in sys.argv
+    if use_batch_api:
+        sys.argv.remove("--batch")
+    
     # Default file for Docker environment
     default_file = "./data/Master Policies/master policy-care classic mediclaim policy.pdf"
     
@@ -467,7 +342,7 @@ if __name__ == "__main__":
         
         # Try the default file first
         if os.path.exists(default_file):
-            process_single_file(default_file)
+            asyncio.run(process_single_file(default_file))
         else:
             # Try to find any available policy file
             logger.info("Default file not found. Searching for available policy files...")
@@ -475,7 +350,7 @@ if __name__ == "__main__":
             
             if found_file:
                 logger.info(f"Found policy file: {found_file}")
-                process_single_file(found_file)
+                asyncio.run(process_single_file(found_file))
             else:
                 logger.error("No policy files found. Please provide a file path.")
                 print("Usage: python main.py --file <file_path>")
@@ -487,7 +362,7 @@ if __name__ == "__main__":
         # Single argument - treat as directory path (legacy mode)
         directory_path = sys.argv[1]
         if os.path.isdir(directory_path):
-            process_directory(directory_path)
+            asyncio.run(process_directory(directory_path, use_batch_api))
         else:
             logger.error(f"Directory not found: {directory_path}")
             sys.exit(1)
@@ -497,14 +372,14 @@ if __name__ == "__main__":
         if sys.argv[1] == "--file":
             file_path = sys.argv[2]
             if os.path.isfile(file_path):
-                process_single_file(file_path)
+                asyncio.run(process_single_file(file_path))
             else:
                 logger.error(f"File not found: {file_path}")
                 sys.exit(1)
         elif sys.argv[1] == "--dir":
             directory_path = sys.argv[2]
             if os.path.isdir(directory_path):
-                process_directory(directory_path)
+                asyncio.run(process_directory(directory_path, use_batch_api))
             else:
                 logger.error(f"Directory not found: {directory_path}")
                 sys.exit(1)
@@ -519,4 +394,5 @@ if __name__ == "__main__":
         print("Usage: python main.py --file <file_path>")
         print("       python main.py --dir <directory_path>")
         print("       python main.py <directory_path> # legacy mode")
+        print("       add --batch to process a directory through the provider batch APIs")
         sys.exit(1) 
\ No newline at end of file
@@ -1,8 +1,12 @@
 import os
+import asyncio
 import logging
 import json
+import weakref
+import httpx
 from mistralai import Mistral
 from dotenv import load_dotenv
+from llm_config import get_llm_settings
 from schemas import ExtractedFields
 
 logging.basicConfig(level=logging.INFO)
@@ -13,22 +17,49 @@ MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 
 logger.info("Starting Mistral extraction...")
 
-client = Mistral(api_key=MISTRAL_API_KEY)
-
-def extract_fields_with_mistral(prompt):
-    logger.info("Calling Mistral API...")    
+def _http2_available():
+    """HTTP/2 needs the optional h2 package (httpx[http2]); without it httpx speaks HTTP/1.1."""
     try:
-        response = client.chat.complete(
-            model="mistral-large-latest", 
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# Keep-alive pool sized for concurrent directory runs, so repeated calls skip the TLS
+# handshake; with HTTP/2 the concurrent requests are multiplexed over one connection
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = httpx.Timeout(get_llm_settings('mistral')['timeout'], connect=10.0)
+_HTTP2 = _http2_available()
+
+# Module-level client shared by every call so its HTTP connection pool is reused
+_http_client = httpx.Client(http2=_HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+client = Mistral(api_key=MISTRAL_API_KEY, client=_http_client)
+
+# An httpx.AsyncClient's pool is bound to the event loop it first runs on, and the entry
+# points start a fresh loop per file or directory, so one async client is kept per loop
+_async_clients = weakref.WeakKeyDictionary()
+
+def _get_async_client():
+    """Return the Mistral client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = Mistral(
+            api_key=MISTRAL_API_KEY,
+            client=_http_client,
+            async_client=httpx.AsyncClient(http2=_HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
         )
-    except Exception as e:
-        logger.error(f"Error during Mistral extraction: {e}")
-        return None
-    
-    logger.info("Mistral API call successful.")
-    
+        _async_clients[loop] = async_client
+    return async_client
+
+def _request_kwargs(prompt):
+    return {
+        "model": "mistral-large-latest",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+
+def _parse_response(response):
     # Parse and validate the response
     try:
         content = response.choices[0].message.content.strip()
@@ -48,4 +79,24 @@ def extract_fields_with_mistral(prompt):
         return None
     except Exception as e:
         logger.error(f"Failed to validate Mistral response against schema: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def extract_fields_with_mistral(prompt):
+    logger.info("Calling Mistral API...")    
+    try:
+        response = client.chat.complete(**_request_kwargs(prompt))
+    except Exception as e:
+        logger.error(f"Error during Mistral extraction: {e}")
+        return None
+    
+    logger.info("Mistral API call successful.")
+    return _parse_response(response)
+
+async def extract_fields_with_mistral_async(prompt):
+    """Async variant of extract_fields_with_mistral for concurrent provider fan-out."""
+    logger.info("Calling Mistral API (async)...")
+    # API/transport errors propagate so the dispatcher can tell an outage from a bad answer
+    response = await _get_async_client().chat.complete_async(**_request_kwargs(prompt))
+    
+    logger.info("Mistral API call successful.")
+    return _parse_response(response)
@@ -1,8 +1,10 @@
 import os
+import asyncio
 import logging
 import json
+import weakref
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from schemas import ExtractedFields
 
 logging.basicConfig(level=logging.INFO)
@@ -13,22 +15,38 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 logger.info("Starting OpenAI extraction...")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-def extract_fields_with_openai(prompt):
-    logger.info("Calling OpenAI API...")
+def _async_http_client():
+    """Use the SDK's aiohttp transport for the async client when the aiohttp extra is installed."""
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini", 
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
-    except Exception as e:
-        logger.error(f"Error during OpenAI extraction: {e}")
+        from openai import DefaultAioHttpClient
+        return DefaultAioHttpClient()
+    except (ImportError, RuntimeError):  # older SDK or aiohttp not installed; fall back to httpx
         return None
-    
-    logger.info("OpenAI API call successful.")
-    
+
+# Module-level client shared by every call so its HTTP connection pool is reused
+client = OpenAI(api_key=OPENAI_API_KEY)
+
+# The async client's connection pool is bound to the event loop it first runs on, and the
+# entry points start a fresh loop per file or directory, so one client is kept per loop
+_async_clients = weakref.WeakKeyDictionary()
+
+def _get_async_client():
+    """Return the async client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=_async_http_client())
+        _async_clients[loop] = async_client
+    return async_client
+
+def _request_kwargs(prompt):
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+
+def _parse_response(response):
     # Parse and validate the response
     try:
         content = response.choices[0].message.content.strip()
@@ -48,4 +66,24 @@ def extract_fields_with_openai(prompt):
         return None
     except Exception as e:
         logger.error(f"Failed to validate OpenAI response against schema: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def extract_fields_with_openai(prompt):
+    logger.info("Calling OpenAI API...")
+    try:
+        response = client.chat.completions.create(**_request_kwargs(prompt))
+    except Exception as e:
+        logger.error(f"Error during OpenAI extraction: {e}")
+        return None
+    
+    logger.info("OpenAI API call successful.")
+    return _parse_response(response)
+
+async def extract_fields_with_openai_async(prompt):
+    """Async variant of extract_fields_with_openai for concurrent provider fan-out."""
+    logger.info("Calling OpenAI API (async)...")
+    # API/transport errors propagate so the dispatcher can tell an outage from a bad answer
+    response = await _get_async_client().chat.completions.create(**_request_kwargs(prompt))
+    
+    logger.info("OpenAI API call successful.")
+    return _parse_response(response)
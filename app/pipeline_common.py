@@ -0,0 +1,121 @@
+"""
+Shared Pipeline Helpers for the Policy Extraction Entry Points
+
+This module holds the sample claim data and the document classification,
+routing and result parsing helpers used by both main_configurable and
+main_fixed, so the two pipelines stay in step.
+"""
+
+import os
+import logging
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from policy_classifier import classify_policy_document, PolicyType
+
+logger = logging.getLogger(__name__)
+
+# Sample claim data for testing (in real scenario, this would come from claim documents).
+# validate_policy_rules only reads it, so one copy is shared by every model and run.
+SAMPLE_CLAIM_DATA = {
+    "admission_date": "2024-01-15",
+    "claim_amount": 50000,
+    "condition": "cardiac",
+    "hospital_bill": {
+        "room_rent": 5000,
+        "icu_charges": 15000,
+        "procedure": "cardiac surgery",
+        "procedure_cost": 30000,
+        "itemized_bill": {
+            "toiletries": 500,
+            "food": 1000
+        }
+    },
+    "discharge_summary": {
+        "procedure": "cardiac surgery",
+        "is_daycare": False
+    }
+}
+
+# Worker processes used to classify a directory's documents; classification is CPU-bound text analysis
+CLASSIFY_NUMBER_OF_PROCESSES = int(os.getenv('CLASSIFY_NUMBER_OF_PROCESSES', max(1, (os.cpu_count() or 2) - 1)))
+
+def _classify_entry(metadata_entry):
+    # Module-level so worker processes can unpickle it
+    return classify_policy_document(
+        filename=metadata_entry.get('filename', ''),
+        content=metadata_entry.get('text', ''),
+        metadata=metadata_entry
+    )
+
+def classify_documents(metadata_entries):
+    """Classify documents, spreading them over worker processes when there is more than one."""
+    workers = min(CLASSIFY_NUMBER_OF_PROCESSES, len(metadata_entries))
+    if workers <= 1:
+        return [_classify_entry(metadata_entry) for metadata_entry in metadata_entries]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_classify_entry, metadata_entries))
+
+# Processing pipeline chosen for each document type; anything else uses the general one
+_PIPELINE_FOR_TYPE = {
+    PolicyType.HEALTH_INSURANCE: "health insurance extraction pipeline",
+    PolicyType.MASTER_POLICY: "health insurance extraction pipeline",
+    PolicyType.LIFE_INSURANCE: "life insurance extraction pipeline",
+    PolicyType.CLAIM_DOCUMENT: "claim processing pipeline",
+    PolicyType.HOSPITAL_BILL: "claim processing pipeline",
+    PolicyType.MEDICAL_REPORT: "medical document processing pipeline",
+}
+
+def pipeline_for_type(document_type):
+    """Name of the processing pipeline used for a classified document type."""
+    return _PIPELINE_FOR_TYPE.get(document_type, "general processing pipeline")
+
+def is_known_type(document_type):
+    """Whether a classified document type has a dedicated processing pipeline."""
+    return document_type in _PIPELINE_FOR_TYPE
+
+def is_valid_result(result_json):
+    """Check whether a provider returned something that can be processed."""
+    if result_json is None:
+        return False
+    elif isinstance(result_json, dict):
+        return True
+    elif isinstance(result_json, str):
+        return bool(result_json.strip())
+    return False
+
+def _strip_code_fence(response):
+    """Remove a surrounding ```json / ``` fence from an LLM response."""
+    cleaned_response = response.strip()
+    if cleaned_response.startswith("```json"):
+        json_start = cleaned_response.find("```json") + 7
+    elif cleaned_response.startswith("```"):
+        json_start = cleaned_response.find("```") + 3
+    else:
+        return cleaned_response
+    json_end = cleaned_response.rfind("```")
+    if json_end > json_start:
+        cleaned_response = cleaned_response[json_start:json_end].strip()
+    return cleaned_response
+
+def parse_extraction_results(extraction_results):
+    """Parse every provider's response once; unusable responses are left out."""
+    parsed_results = {}
+    for model, result_json in extraction_results.items():
+        if not is_valid_result(result_json):
+            continue
+        if not isinstance(result_json, str):
+            parsed_results[model] = result_json
+            continue
+        try:
+            parsed_results[model] = orjson.loads(result_json)
+            continue
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON from {model}: {e}")
+            logger.error(f"Raw response: {result_json[:200]}...")
+        # Some models wrap their JSON in a markdown code fence
+        try:
+            parsed_results[model] = orjson.loads(_strip_code_fence(result_json))
+            logger.info(f"Successfully parsed {model} response after cleanup")
+        except orjson.JSONDecodeError:
+            pass
+    return parsed_results
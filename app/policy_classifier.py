@@ -1,5 +1,8 @@
 import re
+import os
+import hashlib
 import logging
+import pickle
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -8,6 +11,13 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Classifications are cached on disk by a hash of the document so reprocessing the
+# same file (e.g. the Docker default file) skips the pattern matching entirely
+ENABLE_CLASSIFICATION_CACHE = os.getenv('ENABLE_CLASSIFICATION_CACHE', 'true').lower() == 'true'
+CLASSIFICATION_CACHE_DIR = os.getenv('CLASSIFICATION_CACHE_DIR', os.path.join('output', '.cache', 'classify'))
+# Bump whenever the classification patterns change so stale results are not served
+CLASSIFICATION_CACHE_VERSION = 1
+
 class PolicyType(Enum):
     """Enumeration of policy document types."""
     HEALTH_INSURANCE = "health_insurance"
@@ -492,8 +502,51 @@ class PolicyClassifier:
         
         return True
 
+def _classification_cache_key(filename: str, content: Optional[str], metadata: Optional[Dict[str, Any]]) -> str:
+    """Hash everything the classifier reads; the document text is hashed once, not again via metadata."""
+    digest = hashlib.blake2b(digest_size=16)
+    other_metadata = {key: value for key, value in (metadata or {}).items() if key != 'text'}
+    for part in (str(CLASSIFICATION_CACHE_VERSION), filename, content or "",
+                 json.dumps(other_metadata, sort_keys=True, default=str)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _load_cached_classification(path: str) -> Optional[ClassificationResult]:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable classification cache entry: {e}")
+        return None
+
+def _store_cached_classification(path: str, result: ClassificationResult):
+    os.makedirs(CLASSIFICATION_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Atomic rename so a crashed run never leaves a truncated entry behind
+    os.replace(tmp_path, path)
+
 def classify_policy_document(filename: str, content: str = None, 
                            metadata: Dict[str, Any] = None) -> ClassificationResult:
-    """Convenience function to classify a policy document."""
-    classifier = PolicyClassifier()
-    return classifier.classify_document(filename, content, metadata) 
\ No newline at end of file
+    """Convenience function to classify a policy document, reusing cached results."""
+    if not ENABLE_CLASSIFICATION_CACHE:
+        return PolicyClassifier().classify_document(filename, content, metadata)
+    
+    path = os.path.join(CLASSIFICATION_CACHE_DIR, f"{_classification_cache_key(filename, content, metadata)}.pkl")
+    cached = _load_cached_classification(path)
+    if cached is not None:
+        logger.info(f"Using cached classification for {filename}")
+        return cached
+    
+    result = PolicyClassifier().classify_document(filename, content, metadata)
+    # Failed classifications are retried next time rather than remembered
+    if result.extraction_method != "error_fallback":
+        try:
+            _store_cached_classification(path, result)
+        except OSError as e:
+            logger.warning(f"Failed to cache classification for {filename}: {e}")
+    return result 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from policy_rules import PolicyRuleReport, RuleResult, RuleDecision, RuleSection
@@ -253,9 +253,11 @@ class PolicyReportGenerator:
         if not rows:
             return "No policy rule validation results available."
         
-        # Create header
-        table = "| SECTION | RULE | CRITERIA | DECISION IF FAILS | DOCUMENT REQUIRED | STATUS | ACTUAL DECISION | REASON |\n"
-        table += "|---------|------|----------|-------------------|-------------------|--------|-----------------|--------|\n"
+        # Create header; parts are joined once at the end instead of growing one string
+        parts = [
+            "| SECTION | RULE | CRITERIA | DECISION IF FAILS | DOCUMENT REQUIRED | STATUS | ACTUAL DECISION | REASON |\n",
+            "|---------|------|----------|-------------------|-------------------|--------|-----------------|--------|\n"
+        ]
         
         # Create data rows
         for row in rows:
@@ -265,16 +267,16 @@ class PolicyReportGenerator:
             # Escape pipe characters in reason
             reason = row.reason.replace("|", "\\|")
             
-            table += f"| {row.section} | {row.rule} | {row.criteria} | {row.decision_if_fails} | {row.document_required} | {row.status} | {actual_decision} | {reason} |\n"
+            parts.append(f"| {row.section} | {row.rule} | {row.criteria} | {row.decision_if_fails} | {row.document_required} | {row.status} | {actual_decision} | {reason} |\n")
         
-        return table
+        return "".join(parts)
     
     def generate_html_table(self, rows: List[PolicyRuleTableRow]) -> str:
         """Generate HTML table format."""
         if not rows:
             return "<p>No policy rule validation results available.</p>"
         
-        html = """
+        parts = ["""
         <style>
         .policy-table { border-collapse: collapse; width: 100%; margin: 20px 0; }
         .policy-table th, .policy-table td { border: 1px solid #ddd; padding: 8px; text-align: left; }
@@ -299,7 +301,7 @@ class PolicyReportGenerator:
         </tr>
         </thead>
         <tbody>
-        """
+        """]
         
         for row in rows:
             if row.status == "PASS":
@@ -315,7 +317,7 @@ class PolicyReportGenerator:
             # Escape HTML characters in reason
             reason = row.reason.replace("<", "&lt;").replace(">", "&gt;").replace("&", "&amp;")
             
-            html += f"""
+            parts.append(f"""
             <tr class="{status_class}">
                 <td>{row.section}</td>
                 <td>{row.rule}</td>
@@ -326,10 +328,10 @@ class PolicyReportGenerator:
                 <td class="deduction">{actual_decision}</td>
                 <td class="reason">{reason}</td>
             </tr>
-            """
+            """)
         
-        html += "</tbody></table>"
-        return html
+        parts.append("</tbody></table>")
+        return "".join(parts)
     
     def generate_text_report(self, rows: List[PolicyRuleTableRow], policy_rule_report: PolicyRuleReport) -> str:
         """Generate simple text format report."""
@@ -378,22 +380,25 @@ Key Observations:
                 sections[row.section] = []
             sections[row.section].append(row)
         
-        # Generate section-wise text
+        # Generate section-wise text, joined once at the end
+        parts = [text_report]
         for section_name, section_rules in sections.items():
-            text_report += f"\n{section_name.upper()}:\n"
-            text_report += "-" * len(section_name) + "\n"
+            parts.append(f"\n{section_name.upper()}:\n")
+            parts.append("-" * len(section_name) + "\n")
             
             for rule in section_rules:
                 status_icon = "✅" if rule.status == "PASS" else "❌"
                 deduction_info = f" (₹{rule.deduction_amount:,.2f})" if rule.deduction_amount else ""
                 
-                text_report += f"{status_icon} {rule.rule}\n"
-                text_report += f"   Criteria: {rule.criteria}\n"
-                text_report += f"   Decision: {rule.actual_decision}{deduction_info}\n"
-                text_report += f"   Reason: {rule.reason}\n"
-                text_report += f"   Document Required: {rule.document_required}\n\n"
+                parts.append(
+                    f"{status_icon} {rule.rule}\n"
+                    f"   Criteria: {rule.criteria}\n"
+                    f"   Decision: {rule.actual_decision}{deduction_info}\n"
+                    f"   Reason: {rule.reason}\n"
+                    f"   Document Required: {rule.document_required}\n\n"
+                )
         
-        return text_report
+        return "".join(parts)
     
     def generate_summary_report(self, policy_rule_report: PolicyRuleReport) -> str:
         """Generate a summary report with key statistics."""
@@ -436,6 +441,21 @@ Key Observations:
         
         return summary
     
+    def render_all_formats(self, policy_rule_report: PolicyRuleReport,
+                           formats: Sequence[str] = ("markdown", "text", "html")) -> Dict[str, str]:
+        """Render the requested report formats from a single pass over the rule results."""
+        rows = self.generate_table_rows(policy_rule_report)
+        reports = {}
+        if "markdown" in formats or "html" in formats:
+            summary = self.generate_summary_report(policy_rule_report)
+            if "markdown" in formats:
+                reports["markdown"] = summary + "\n\n" + self.generate_markdown_table(rows)
+        if "text" in formats:
+            reports["text"] = self.generate_text_report(rows, policy_rule_report)
+        if "html" in formats:
+            reports["html"] = summary + "\n\n" + self.generate_html_table(rows)
+        return reports
+    
     def save_report(self, policy_rule_report: PolicyRuleReport, output_file: str, format_type: str = "markdown"):
         """Save policy rule validation report to file."""
         rows = self.generate_table_rows(policy_rule_report)
@@ -475,4 +495,9 @@ def generate_policy_rule_report(policy_rule_report: PolicyRuleReport, output_fil
         else:
             summary = generator.generate_summary_report(policy_rule_report)
             table = generator.generate_markdown_table(rows)
-            return summary + "\n\n" + table 
\ No newline at end of file
+            return summary + "\n\n" + table 
+
+def generate_policy_rule_reports(policy_rule_report: PolicyRuleReport,
+                                 formats: Sequence[str] = ("markdown", "text", "html")) -> Dict[str, str]:
+    """Generate the requested policy rule reports (markdown, text and/or HTML) at once, keyed by format."""
+    return PolicyReportGenerator().render_all_formats(policy_rule_report, formats)
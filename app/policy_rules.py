@@ -1,5 +1,9 @@
 import re
+import copy
+import json
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, date
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
@@ -7,6 +11,27 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Rule tables, built once at import rather than on every validation call
+IRDA_DAYCARE_PROCEDURES = (
+    'cataract', 'hernia', 'tonsillectomy', 'adenoidectomy',
+    'dental', 'endoscopy', 'colonoscopy', 'biopsy'
+)
+DISEASE_WAITING_PERIODS = {
+    'diabetes': 90,
+    'hypertension': 90,
+    'cardiac': 180,
+    'cancer': 365
+}
+MATERNITY_CONDITIONS = ('pregnancy', 'delivery', 'cesarean', 'maternity', 'obstetric', 'gynecological')
+NON_PAYABLE_ITEMS = (
+    'toiletries', 'personal items', 'food', 'telephone', 'tv',
+    'attendant charges', 'documentation charges', 'administrative charges'
+)
+
+# One case-insensitive substring scan per bill item instead of a loop over the table
+_NON_PAYABLE_RE = re.compile("|".join(map(re.escape, NON_PAYABLE_ITEMS)), re.IGNORECASE)
+_MATERNITY_RE = re.compile("|".join(map(re.escape, MATERNITY_CONDITIONS)), re.IGNORECASE)
+
 class RuleDecision(Enum):
     PASS = "Pass"
     REJECT = "Reject"
@@ -480,12 +505,6 @@ class PolicyRuleValidator:
     def validate_daycare(self, policy_data: Dict[str, Any], discharge_summary: Dict[str, Any]) -> RuleResult:
         """Validate daycare procedures against IRDA guidelines."""
         try:
-            # IRDA-approved daycare procedures
-            irda_daycare_procedures = [
-                'cataract', 'hernia', 'tonsillectomy', 'adenoidectomy',
-                'dental', 'endoscopy', 'colonoscopy', 'biopsy'
-            ]
-            
             procedure = discharge_summary.get('procedure', '').lower()
             is_daycare = discharge_summary.get('is_daycare', False)
             
@@ -500,7 +519,7 @@ class PolicyRuleValidator:
                 )
             
             # Check if procedure is in IRDA list
-            is_irda_approved = any(proc in procedure for proc in irda_daycare_procedures)
+            is_irda_approved = any(proc in procedure for proc in IRDA_DAYCARE_PROCEDURES)
             
             if is_irda_approved:
                 return RuleResult(
@@ -624,15 +643,9 @@ class PolicyRuleValidator:
         
         # Disease-specific waiting periods
         if condition:
-            disease_waiting_periods = {
-                'diabetes': 90,
-                'hypertension': 90,
-                'cardiac': 180,
-                'cancer': 365
-            }
-            
-            for disease, waiting_days in disease_waiting_periods.items():
-                if disease in condition.lower():
+            condition_lower = condition.lower()
+            for disease, waiting_days in DISEASE_WAITING_PERIODS.items():
+                if disease in condition_lower:
                     try:
                         # Check if we have valid dates
                         if not inception_date or not admission_date:
@@ -722,8 +735,7 @@ class PolicyRuleValidator:
         
         # Maternity waiting period (only for female patients with maternity-related conditions)
         # Check if this is a maternity-related claim
-        maternity_conditions = ['pregnancy', 'delivery', 'cesarean', 'maternity', 'obstetric', 'gynecological']
-        is_maternity_related = condition and any(maternity_condition in condition.lower() for maternity_condition in maternity_conditions)
+        is_maternity_related = condition and _MATERNITY_RE.search(condition) is not None
         
         # For now, we'll assume the patient is male (based on the name "Patel Dashrathbhai A")
         # In a real system, this would come from patient data
@@ -836,17 +848,11 @@ class PolicyRuleValidator:
     def validate_non_medical_items(self, hospital_bill: Dict[str, Any]) -> RuleResult:
         """Validate non-medical items against IRDA guidelines."""
         try:
-            # IRDA non-payable items
-            non_payable_items = [
-                'toiletries', 'personal items', 'food', 'telephone', 'tv',
-                'attendant charges', 'documentation charges', 'administrative charges'
-            ]
-            
             itemized_bill = hospital_bill.get('itemized_bill', {})
             non_medical_deduction = 0
             
             for item, amount in itemized_bill.items():
-                if any(non_payable in item.lower() for non_payable in non_payable_items):
+                if _NON_PAYABLE_RE.search(item):
                     non_medical_deduction += amount
             
             if non_medical_deduction == 0:
@@ -1016,7 +1022,39 @@ class PolicyRuleValidator:
             status="REJECTED"  # Early termination means rejected
         )
 
+# PolicyRuleValidator keeps no per-call state (the lookup tables are the module constants
+# above and self.rules is descriptive metadata), so one instance serves every call
+_validator = PolicyRuleValidator()
+
+# Recent reports keyed on the serialized inputs and today's date (lapse and admission
+# defaults are relative to it); each entry keeps copies of the inputs it was built from
+_REPORT_CACHE_SIZE = 128
+_report_cache: "OrderedDict[Tuple[str, str, date], Tuple[Any, Any, PolicyRuleReport]]" = OrderedDict()
+_report_cache_lock = threading.Lock()
+
 def validate_policy_rules(policy_data: Dict[str, Any], claim_data: Dict[str, Any] = None) -> PolicyRuleReport:
-    """Convenience function to validate policy rules."""
-    validator = PolicyRuleValidator()
-    return validator.validate_policy_rules(policy_data, claim_data) 
\ No newline at end of file
+    """
+    Convenience function to validate policy rules.
+
+    Providers often extract identical policy data, so reports are memoized. The
+    serialized inputs only locate an entry: the validator always sees the original
+    objects, a hit also needs inputs equal to the cached ones (so 1 and "1" keys or
+    tuples and lists are not conflated), and every caller gets its own copy of the report.
+    """
+    try:
+        key = (json.dumps(policy_data, sort_keys=True), json.dumps(claim_data, sort_keys=True), date.today())
+    except TypeError:  # Non-JSON values (e.g. date objects) are validated uncached
+        return _validator.validate_policy_rules(policy_data, claim_data)
+    
+    with _report_cache_lock:
+        entry = _report_cache.get(key)
+        if entry is not None and entry[0] == policy_data and entry[1] == claim_data:
+            _report_cache.move_to_end(key)
+            return copy.deepcopy(entry[2])
+    
+    report = _validator.validate_policy_rules(policy_data, claim_data)
+    with _report_cache_lock:
+        _report_cache[key] = (copy.deepcopy(policy_data), copy.deepcopy(claim_data), report)
+        if len(_report_cache) > _REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+    return copy.deepcopy(report)
@@ -1,5 +1,6 @@
-def get_openai_policy_prompt(metadata_list_json):
-    return f"""
+# Static instruction text is kept in module-level constants so each call only appends the metadata
+
+_OPENAI_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of master policy documents text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -42,11 +43,12 @@ IMPORTANT: Return a valid JSON object with these exact field names as keys:
 - artificial_prostheses_aids_capping: Cap on artificial prostheses, aids
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
 """
 
-def get_mistral_policy_prompt(metadata_list_json):
-    return f"""
+def get_openai_policy_prompt(metadata_list_json):
+    return _OPENAI_PROMPT_PREFIX + metadata_list_json + "\n"
+
+_MISTRAL_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of policy document text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -90,11 +92,12 @@ IMPORTANT: Return a valid JSON object with these exact field names as keys:
 - artificial_prostheses_aids_capping: Cap on artificial prostheses, aids
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
 """
 
-def get_gemini_policy_prompt(metadata_list_json):
-    return f"""
+def get_mistral_policy_prompt(metadata_list_json):
+    return _MISTRAL_PROMPT_PREFIX + metadata_list_json + "\n"
+
+_GEMINI_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of policy document text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -139,5 +142,7 @@ IMPORTANT: Return a valid JSON object matching the ExtractedFields schema with t
 - artificial_prostheses_aids_capping: Cap on artificial prostheses, aids
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
-"""
\ No newline at end of file
+"""
+
+def get_gemini_policy_prompt(metadata_list_json):
+    return _GEMINI_PROMPT_PREFIX + metadata_list_json + "\n"
\ No newline at end of file
@@ -1,5 +1,8 @@
-def get_openai_policy_prompt(metadata_list_json):
-    return f"""
+# Static instruction text is kept in module-level constants so each call only appends the metadata.
+# Keep the instructions first and the per-document metadata last: providers that cache prompt
+# prefixes (e.g. OpenAI's automatic caching) can then reuse the identical instruction block.
+
+_OPENAI_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of policy document text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -52,11 +55,12 @@ IMPORTANT: Return a valid JSON object with these exact field names as keys:
 - date_of_admission: Date of admission to hospital (in DD/MM/YYYY, DD/MM/YY, D/M/YY, or DD/M/YY format if found)
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
 """
 
-def get_mistral_policy_prompt(metadata_list_json):
-    return f"""
+def get_openai_policy_prompt(metadata_list_json):
+    return _OPENAI_PROMPT_PREFIX + metadata_list_json + "\n"
+
+_MISTRAL_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of document text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -112,11 +116,12 @@ IMPORTANT: Return a valid JSON object with these exact field names as keys:
 - date_of_admission: Date of admission to hospital (in DD/MM/YYYY, DD/MM/YY, D/M/YY, or DD/M/YY format if found)
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
 """
 
-def get_gemini_policy_prompt(metadata_list_json):
-    return f"""
+def get_mistral_policy_prompt(metadata_list_json):
+    return _MISTRAL_PROMPT_PREFIX + metadata_list_json + "\n"
+
+_GEMINI_PROMPT_PREFIX = """
 You are a health insurance analyst specializing in policy document analysis.
 
 You are given a list of document text segments, each with metadata about its source file, extraction method, and extraction success. 
@@ -175,5 +180,7 @@ IMPORTANT: Return a valid JSON object matching the ExtractedFields schema with t
 - date_of_admission: Date of admission to hospital (in DD/MM/YYYY, DD/MM/YY, D/M/YY, or DD/M/YY format if found)
 
 Here is the list of policy document segments (as JSON):
-{metadata_list_json}
-""" 
\ No newline at end of file
+"""
+
+def get_gemini_policy_prompt(metadata_list_json):
+    return _GEMINI_PROMPT_PREFIX + metadata_list_json + "\n" 
\ No newline at end of file
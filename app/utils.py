@@ -3,13 +3,45 @@ from PIL import Image
 from pdf2image import convert_from_path
 import os
 
+try:
+    import cv2
+    import numpy as np
+except ImportError:  # OpenCV is optional; OCR falls back to the raw image
+    cv2 = None
+
+# Binarized input lets Tesseract skip its own inversion/thresholding pass
+TESSERACT_CONFIG = "--oem 1 --psm 6 -c tessedit_do_invert=0"
+
+def preprocess_for_ocr(image):
+    """Convert a PIL image to a high-contrast binary image for Tesseract."""
+    if cv2 is None:
+        return image
+    gray = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2GRAY)
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 2
+    )
+
+def _image_to_string(image):
+    if cv2 is None:
+        return pytesseract.image_to_string(image)
+    return pytesseract.image_to_string(preprocess_for_ocr(image), config=TESSERACT_CONFIG)
+
 def ocr_from_image(image_path):
     image = Image.open(image_path)
-    return pytesseract.image_to_string(image)
+    return _image_to_string(image)
 
 def ocr_from_scanned_pdf(pdf_path):
     text = ""
     images = convert_from_path(pdf_path, dpi=300)
     for i, image in enumerate(images):
-        text += pytesseract.image_to_string(image) + "\n"
+        text += _image_to_string(image) + "\n"
+    return text
+
+def ocr_from_fitz_doc(doc, dpi=300):
+    """OCR every page of an already open PyMuPDF document without re-reading the file."""
+    text = ""
+    for page in doc:
+        pix = page.get_pixmap(dpi=dpi)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        text += _image_to_string(image) + "\n"
     return text
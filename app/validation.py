@@ -5,6 +5,33 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Accepted date formats; any one appearing in the value is enough, so they are fused into one scan
+_DATE_PATTERNS = [
+    r'\d{1,2}/\d{1,2}/\d{4}',  # DD/MM/YYYY or MM/DD/YYYY
+    r'\d{1,2}/\d{1,2}/\d{2}',  # DD/MM/YY or MM/DD/YY
+    r'\d{1,2}/\d{1}/\d{2}',  # DD/M/YY or MM/D/YY (e.g., 7/5/25)
+    r'\d{1}/\d{1,2}/\d{2}',  # D/MM/YY or M/DD/YY (e.g., 7/12/25)
+    r'\d{1}/\d{1}/\d{2}',  # D/M/YY or M/D/YY (e.g., 7/5/25)
+    r'\d{4}-\d{1,2}-\d{1,2}',  # YYYY-MM-DD
+    r'\d{1,2}-\d{1,2}-\d{4}',  # DD-MM-YYYY or MM-DD-YYYY
+    r'\d{1,2}-\d{1,2}-\d{2}',  # DD-MM-YY or MM-DD-YY
+    r'\d{1,2}-\d{1}-\d{2}',  # DD-M-YY or MM-D-YY
+    r'\d{1}-\d{1,2}-\d{2}',  # D-MM-YY or M-DD-YY
+    r'\d{1}-\d{1}-\d{2}',  # D-M-YY or M-D-YY
+    r'\d{1,2}\.\d{1,2}\.\d{4}',  # DD.MM.YYYY or MM.DD.YYYY
+    r'\d{1,2}\.\d{1,2}\.\d{2}',  # DD.MM.YY or MM.DD.YY
+    r'\d{1,2}\.\d{1}\.\d{2}',  # DD.M.YY or MM.D.YY
+    r'\d{1}\.\d{1,2}\.\d{2}',  # D.MM.YY or M.DD.YY
+    r'\d{1}\.\d{1}\.\d{2}',  # D.M.YY or M.D.YY
+]
+_DATE_RE = re.compile("|".join(_DATE_PATTERNS))
+
+# Compiled once at import instead of on every field value
+_CURRENCY_RE = re.compile(r'[₹$€£,]')
+_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+_PERCENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_PERCENT_WORD_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:percent|per cent)')
+
 @dataclass
 class ValidationResult:
     """Result of validation for a single field."""
@@ -514,9 +541,9 @@ class PolicyCappingValidator:
         
         if isinstance(value, str):
             # Remove common currency symbols and commas
-            cleaned = re.sub(r'[₹$€£,]', '', value.strip())
+            cleaned = _CURRENCY_RE.sub('', value.strip())
             # Extract number
-            match = re.search(r'(\d+(?:\.\d+)?)', cleaned)
+            match = _NUMBER_RE.search(cleaned)
             if match:
                 return float(match.group(1))
         
@@ -531,11 +558,11 @@ class PolicyCappingValidator:
             # Look for percentage patterns
             cleaned = value.strip().lower()
             # Remove % symbol and extract number
-            match = re.search(r'(\d+(?:\.\d+)?)\s*%', cleaned)
+            match = _PERCENT_RE.search(cleaned)
             if match:
                 return float(match.group(1))
             # Also check for "percent" or "per cent"
-            match = re.search(r'(\d+(?:\.\d+)?)\s*(?:percent|per cent)', cleaned)
+            match = _PERCENT_WORD_RE.search(cleaned)
             if match:
                 return float(match.group(1))
         
@@ -553,30 +580,8 @@ class PolicyCappingValidator:
             is_valid = True
         elif isinstance(value, str):
             # Check for common date formats including both YYYY and YY formats
-            date_patterns = [
-                r'\d{1,2}/\d{1,2}/\d{4}',  # DD/MM/YYYY or MM/DD/YYYY
-                r'\d{1,2}/\d{1,2}/\d{2}',   # DD/MM/YY or MM/DD/YY
-                r'\d{1,2}/\d{1}/\d{2}',     # DD/M/YY or MM/D/YY (e.g., 7/5/25)
-                r'\d{1}/\d{1,2}/\d{2}',     # D/MM/YY or M/DD/YY (e.g., 7/12/25)
-                r'\d{1}/\d{1}/\d{2}',       # D/M/YY or M/D/YY (e.g., 7/5/25)
-                r'\d{4}-\d{1,2}-\d{1,2}',  # YYYY-MM-DD
-                r'\d{1,2}-\d{1,2}-\d{4}',  # DD-MM-YYYY or MM-DD-YYYY
-                r'\d{1,2}-\d{1,2}-\d{2}',  # DD-MM-YY or MM-DD-YY
-                r'\d{1,2}-\d{1}-\d{2}',     # DD-M-YY or MM-D-YY
-                r'\d{1}-\d{1,2}-\d{2}',     # D-MM-YY or M-DD-YY
-                r'\d{1}-\d{1}-\d{2}',       # D-M-YY or M-D-YY
-                r'\d{1,2}\.\d{1,2}\.\d{4}',  # DD.MM.YYYY or MM.DD.YYYY
-                r'\d{1,2}\.\d{1,2}\.\d{2}',  # DD.MM.YY or MM.DD.YY
-                r'\d{1,2}\.\d{1}\.\d{2}',     # DD.M.YY or MM.D.YY
-                r'\d{1}\.\d{1,2}\.\d{2}',     # D.MM.YY or M.DD.YY
-                r'\d{1}\.\d{1}\.\d{2}',       # D.M.YY or M.D.YY
-            ]
             
-            is_valid_date = False
-            for pattern in date_patterns:
-                if re.search(pattern, value):
-                    is_valid_date = True
-                    break
+            is_valid_date = _DATE_RE.search(value) is not None
             
             if is_valid_date:
                 is_valid = True
@@ -683,7 +688,10 @@ class PolicyCappingValidator:
         
         return recommendations
 
+# PolicyCappingValidator builds its per-field rule dict in __init__ and validation only reads
+# it, so one module-level validator serves every call instead of rebuilding the dict each time
+_validator = PolicyCappingValidator()
+
 def validate_extraction_result(extraction_data: Dict[str, Any]) -> PolicyValidationReport:
     """Convenience function to validate extraction results."""
-    validator = PolicyCappingValidator()
-    return validator.validate_policy_extraction(extraction_data) 
\ No newline at end of file
+    return _validator.validate_policy_extraction(extraction_data) 
\ No newline at end of file
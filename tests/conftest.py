@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+import weakref
+from pathlib import Path
+
+import pytest
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+@pytest.fixture
+def isolated_dispatch(monkeypatch, tmp_path):
+    """
+    Give a test its own llm_dispatch state: a private, disabled response cache and
+    fresh circuit breakers, rate limiters and semaphores. Tests exercising the
+    cache turn it back on with monkeypatch.
+    """
+    import llm_dispatch
+    monkeypatch.setattr(llm_dispatch, "LLM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_dispatch, "ENABLE_LLM_CACHE", False)
+    monkeypatch.setattr(llm_dispatch, "_circuit_breakers", {})
+    monkeypatch.setattr(llm_dispatch, "_rate_limiters", {})
+    monkeypatch.setattr(llm_dispatch, "_semaphores", weakref.WeakKeyDictionary())
+    return llm_dispatch
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for batch API result handling.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+import batch_extract
+import llm_dispatch
+
+# Every test gets its own cache directory and fresh breakers/semaphores
+pytestmark = pytest.mark.usefixtures("isolated_dispatch")
+
+def _output_line(custom_id, content=None, status_code=200, error=None):
+    body = {"choices": [{"message": {"content": content}}]} if content is not None else None
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}, "error": error})
+
+def test_collect_results_matches_by_custom_id(monkeypatch):
+    """Results are matched by custom_id regardless of order; failed and missing requests become None."""
+    monkeypatch.setattr(batch_extract, "_parse_content", lambda provider, content: json.loads(content))
+    output = "\n".join([
+        _output_line("dir_b", '{"policy_number": "B"}'),
+        _output_line("dir_c", status_code=500, error={"message": "server error"}),
+        _output_line("dir_a", '{"policy_number": "A"}'),
+        "",
+    ])
+
+    results = batch_extract._collect_results("openai", output, ["dir_a", "dir_b", "dir_c", "dir_d"])
+
+    assert results == {
+        "dir_a": {"policy_number": "A"},
+        "dir_b": {"policy_number": "B"},
+        "dir_c": None,
+        "dir_d": None,
+    }
+
+def test_extract_all_batch_falls_back_for_providers_without_batch(monkeypatch):
+    """Batch-capable providers go through their submitter; the rest use the interactive call."""
+    submitted = []
+
+    def submitter(provider):
+        def submit(prompts):
+            submitted.append((provider, list(prompts)))
+            return {custom_id: {"provider": provider} for custom_id in prompts}
+        return submit
+    monkeypatch.setattr(batch_extract, "BATCH_SUBMITTERS", {"openai": submitter("openai"), "mistral": submitter("mistral")})
+
+    def get_extractor(provider):
+        async def extractor(prompt):
+            return {"provider": provider, "interactive": True}
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+
+    results = asyncio.run(batch_extract.extract_all_batch(b'[{"text": "policy"}]', "patient_1", ["openai", "mistral", "gemini"]))
+
+    assert results == {
+        "openai": {"provider": "openai"},
+        "mistral": {"provider": "mistral"},
+        "gemini": {"provider": "gemini", "interactive": True},
+    }
+    assert sorted(submitted) == [("mistral", ["patient_1"]), ("openai", ["patient_1"])]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -4,7 +4,8 @@ Test script for the modular directory scanner.
 """
 
 import logging
-from app.directory_scanner import DirectoryScanner, create_policy_document_scanner
+import os
+from app.directory_scanner import DirectoryScanner, create_policy_document_scanner, iter_policy_pdfs
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -84,5 +85,18 @@ def test_directory_scanner():
     
     print("\n=== Directory Scanner Test Complete ===")
 
+def test_iter_policy_pdfs(tmp_path):
+    """Policy PDFs are found lazily, top-level files first."""
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "Master Policy.PDF").write_text("x")
+    nested = tmp_path / "patient"
+    nested.mkdir()
+    (nested / "patient policy.pdf").write_text("x")
+    (nested / "bill.pdf").write_text("x")
+    
+    found = list(iter_policy_pdfs(str(tmp_path)))
+    assert [os.path.basename(path) for path in found] == ["Master Policy.PDF", "patient policy.pdf"]
+    assert next(iter_policy_pdfs(str(tmp_path / "missing")), None) is None
+
 if __name__ == "__main__":
     test_directory_scanner() 
\ No newline at end of file
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent LLM provider dispatch and the response cache.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+import llm_dispatch
+
+# Every test gets its own cache directory and fresh breakers/semaphores
+pytestmark = pytest.mark.usefixtures("isolated_dispatch")
+
+def _install_fake_extractors(monkeypatch, calls, failing=(), unparseable=()):
+    """Replace the provider SDK extractors with in-process fakes."""
+    def get_extractor(provider):
+        async def extractor(prompt):
+            calls.append(provider)
+            if provider in failing:
+                raise RuntimeError(f"{provider} unavailable")
+            if provider in unparseable:
+                return None
+            return {"provider": provider, "prompt_length": len(prompt)}
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+
+def test_extract_all_runs_every_provider(monkeypatch):
+    """Every requested provider returns a result keyed by name; failures become None."""
+    calls = []
+    _install_fake_extractors(monkeypatch, calls, failing=("mistral",))
+
+    timings = {}
+    results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', timings=timings))
+
+    assert list(results) == ["openai", "mistral", "gemini"]
+    assert set(timings) == {"openai", "mistral", "gemini"}
+    assert results["openai"]["provider"] == "openai"
+    assert results["mistral"] is None
+    assert sorted(calls) == ["gemini", "mistral", "openai"]
+
+def test_extract_all_uses_cache_on_repeat(monkeypatch):
+    """Identical metadata is answered from disk on the second run."""
+    monkeypatch.setattr(llm_dispatch, "ENABLE_LLM_CACHE", True)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls)
+
+    first = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai"]))
+    second = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai"]))
+
+    assert first == second
+    assert calls == ["openai"]
+
+    asyncio.run(llm_dispatch.extract_all('[{"text": "other policy"}]', providers=["openai"]))
+    assert calls == ["openai", "openai"]
+
+def test_whitespace_only_changes_reuse_cache(monkeypatch):
+    """Text that only differs in spacing or escaped line breaks hits the same cache entry."""
+    monkeypatch.setattr(llm_dispatch, "ENABLE_LLM_CACHE", True)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls)
+
+    asyncio.run(llm_dispatch.extract_all('[{"text": "room rent\\n\\ncap 5000"}]', providers=["mistral"]))
+    asyncio.run(llm_dispatch.extract_all('[{"text": "room rent  cap 5000"}]', providers=["mistral"]))
+    assert calls == ["mistral"]
+
+    asyncio.run(llm_dispatch.extract_all('[{"text": "room rent cap 6000"}]', providers=["mistral"]))
+    assert calls == ["mistral", "mistral"]
+
+def test_metadata_is_hashed_once_per_run(monkeypatch, tmp_path):
+    """All providers' cache keys share one hash of the metadata, yet stay distinct per provider."""
+    monkeypatch.setattr(llm_dispatch, "ENABLE_LLM_CACHE", True)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls)
+    digests = []
+    real_digest = llm_dispatch.metadata_cache_digest
+    monkeypatch.setattr(llm_dispatch, "metadata_cache_digest", lambda text: digests.append(text) or real_digest(text))
+
+    asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]'))
+
+    assert len(digests) == 1
+    assert sorted(calls) == ["gemini", "mistral", "openai"]
+    assert len(list(tmp_path.glob("*.json"))) == 3
+
+def test_expired_cache_entry_is_refreshed(monkeypatch):
+    """Entries older than the TTL are ignored and re-fetched from the provider."""
+    monkeypatch.setattr(llm_dispatch, "ENABLE_LLM_CACHE", True)
+    monkeypatch.setattr(llm_dispatch, "LLM_CACHE_TTL_SECONDS", -1)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls)
+
+    asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai"]))
+    asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai"]))
+
+    assert calls == ["openai", "openai"]
+
+def test_slow_provider_times_out_and_retries(monkeypatch):
+    """A provider that never answers is retried, then reported as None without blocking the others."""
+    monkeypatch.setattr(llm_dispatch, "get_llm_settings", lambda provider: {"timeout": 0.05})
+    monkeypatch.setattr(llm_dispatch, "LLM_RETRY_ATTEMPTS", 2)
+    calls = []
+    real_sleep = asyncio.sleep
+    
+    def get_extractor(provider):
+        async def extractor(prompt):
+            calls.append(provider)
+            if provider == "gemini":
+                await real_sleep(10)
+            return {"provider": provider}
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+    
+    async def no_backoff(delay):
+        return None
+    monkeypatch.setattr(llm_dispatch.asyncio, "sleep", no_backoff)
+
+    results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai", "gemini"]))
+
+    assert results["openai"] == {"provider": "openai"}
+    assert results["gemini"] is None
+    assert calls.count("gemini") == 2
+
+class _RateLimitError(Exception):
+    """Stand-in for an SDK's HTTP 429 error, with the response headers it carries."""
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+def test_rate_limited_call_is_retried_after_retry_after(monkeypatch):
+    """A 429 is retried after the provider's Retry-After and does not count against the breaker."""
+    monkeypatch.setattr(llm_dispatch, "LLM_CIRCUIT_BREAKER_FAILURES", 1)
+    calls = []
+    delays = []
+
+    def get_extractor(provider):
+        async def extractor(prompt):
+            calls.append(provider)
+            if len(calls) == 1:
+                raise _RateLimitError(retry_after="7")
+            return {"provider": provider}
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+
+    async def record_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(llm_dispatch.asyncio, "sleep", record_sleep)
+
+    results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai"]))
+
+    assert results["openai"] == {"provider": "openai"}
+    assert calls == ["openai", "openai"]
+    assert delays == [7.0]
+    assert llm_dispatch._circuit_breakers["openai"].failures == 0
+
+def test_persistent_rate_limiting_does_not_open_circuit(monkeypatch):
+    """A provider that stays rate limited gives None but is still called on the next run."""
+    monkeypatch.setattr(llm_dispatch, "LLM_CIRCUIT_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(llm_dispatch, "LLM_RATE_LIMIT_RETRIES", 2)
+    calls = []
+
+    def get_extractor(provider):
+        async def extractor(prompt):
+            calls.append(provider)
+            raise _RateLimitError()
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+
+    async def no_backoff(delay):
+        return None
+    monkeypatch.setattr(llm_dispatch.asyncio, "sleep", no_backoff)
+
+    for _ in range(2):
+        results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["mistral"]))
+        assert results["mistral"] is None
+
+    assert calls.count("mistral") == 6
+
+def test_oversized_prompt_is_skipped(monkeypatch):
+    """Prompts estimated to overflow the provider's context window are never sent."""
+    monkeypatch.setattr(llm_dispatch, "get_llm_settings", lambda provider: {"context_tokens": 1000, "max_tokens": 500})
+    calls = []
+    _install_fake_extractors(monkeypatch, calls)
+
+    results = asyncio.run(llm_dispatch.extract_all('[{"text": "' + "x" * 4000 + '"}]', providers=["openai"]))
+
+    assert results == {"openai": None}
+    assert calls == []
+
+def test_circuit_breaker_skips_failing_provider(monkeypatch):
+    """After repeated failures a provider is not called again until the reset window passes."""
+    monkeypatch.setattr(llm_dispatch, "LLM_CIRCUIT_BREAKER_FAILURES", 2)
+    monkeypatch.setattr(llm_dispatch, "LLM_CIRCUIT_BREAKER_RESET_SECONDS", 60)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls, failing=("mistral",))
+
+    for _ in range(4):
+        results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["openai", "mistral"]))
+        assert results["mistral"] is None
+
+    assert calls.count("mistral") == 2
+    assert calls.count("openai") == 4
+
+    # Once the window has passed, one probe call goes through again
+    llm_dispatch._circuit_breakers["mistral"].reset_seconds = 0
+    asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["mistral"]))
+    assert calls.count("mistral") == 3
+
+def test_circuit_breaker_ignores_unparseable_answers(monkeypatch):
+    """A provider that answers, even with output that fails to parse, is not cut off."""
+    monkeypatch.setattr(llm_dispatch, "LLM_CIRCUIT_BREAKER_FAILURES", 2)
+    calls = []
+    _install_fake_extractors(monkeypatch, calls, unparseable=("mistral",))
+
+    for _ in range(4):
+        results = asyncio.run(llm_dispatch.extract_all('[{"text": "policy"}]', providers=["mistral"]))
+        assert results["mistral"] is None
+
+    assert calls.count("mistral") == 4
+
+def test_rate_limiter_waits_for_token_budget():
+    """Once the per-minute token budget is spent, the next request waits for it to refill."""
+    limiter = llm_dispatch.RateLimiter(tokens_per_minute=6000)
+
+    async def run():
+        await limiter.acquire(6000)
+        start = time.monotonic()
+        await limiter.acquire(10)  # 100 tokens/s refill -> about 0.1s
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.08
+
+def test_unlimited_rate_limiter_never_waits():
+    limiter = llm_dispatch.RateLimiter()
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.acquire(10000)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.05
+
+def test_concurrent_requests_are_capped_per_provider(monkeypatch):
+    """With max_concurrent_requests=1, a provider never has two calls in flight at once."""
+    monkeypatch.setattr(llm_dispatch, "get_llm_settings", lambda provider: {"max_concurrent_requests": 1})
+    in_flight = []
+    peak = []
+
+    def get_extractor(provider):
+        async def extractor(prompt):
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+            return {"provider": provider}
+        return extractor
+    monkeypatch.setattr(llm_dispatch, "_get_extractor", get_extractor)
+
+    async def run():
+        return await asyncio.gather(*(
+            llm_dispatch.extract_all(f'[{{"text": "policy {i}"}}]', providers=["openai"]) for i in range(3)
+        ))
+
+    results = asyncio.run(run())
+
+    assert all(result == {"openai": {"provider": "openai"}} for result in results)
+    assert max(peak) == 1
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for the main_fixed single-file pipeline, with the document loader
+and LLM providers replaced by in-process fakes.
+"""
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+import main_fixed
+
+POLICY_TEXT = "This is a health insurance policy document containing mediclaim coverage details. Room rent capping is 2%."
+
+def test_single_file_runs_through_extraction(monkeypatch, tmp_path, capsys):
+    """A classified file reaches the providers and its results are written to output/."""
+    monkeypatch.chdir(tmp_path)
+
+    loader = types.ModuleType("loader")
+    loader.extract_single_file_with_metadata = lambda file_path: {
+        "filename": "policy.pdf", "text": POLICY_TEXT, "extraction_success": True,
+    }
+    monkeypatch.setitem(sys.modules, "loader", loader)
+
+    extracted = []
+
+    async def extract_all(metadata_json):
+        extracted.append(metadata_json)
+        return {"openai": {"policy_number": "P-1"}, "mistral": None}
+    monkeypatch.setattr(main_fixed, "extract_all", extract_all)
+
+    asyncio.run(main_fixed.process_single_file(str(tmp_path / "policy.pdf")))
+
+    assert len(extracted) == 1
+    assert (tmp_path / "output" / "extracted_summary_openai.json").exists()
+    assert "Extraction complete!" in capsys.readouterr().out
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
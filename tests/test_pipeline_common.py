@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test script for the helpers shared by the extraction entry points.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from pipeline_common import parse_extraction_results
+
+def test_parse_extraction_results():
+    """Responses are parsed once; fenced JSON is recovered and unusable responses are dropped."""
+    parsed = parse_extraction_results({
+        "openai": '{"policy_number": "A"}',
+        "mistral": '```json\n{"policy_number": "B"}\n```',
+        "gemini": {"policy_number": "C"},
+        "broken": "not json",
+        "empty": "  ",
+        "missing": None,
+    })
+
+    assert parsed == {
+        "openai": {"policy_number": "A"},
+        "mistral": {"policy_number": "B"},
+        "gemini": {"policy_number": "C"},
+    }
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -259,6 +259,27 @@ def test_confidence_scoring():
         is_valid = classifier.validate_classification(classification_result)
         print(f"  Valid Classification: {'✅ Yes' if is_valid else '❌ No'}")
 
+def test_classification_cache(monkeypatch, tmp_path):
+    """Reclassifying the same document is answered from the on-disk cache."""
+    import policy_classifier
+    monkeypatch.setattr(policy_classifier, "CLASSIFICATION_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(policy_classifier, "ENABLE_CLASSIFICATION_CACHE", True)
+    content = "This is a mediclaim policy with room rent capping and ICU coverage."
+    
+    first = classify_policy_document("mediclaim_policy.pdf", content)
+    assert len(list(tmp_path.iterdir())) == 1
+    
+    calls = []
+    monkeypatch.setattr(PolicyClassifier, "classify_document", lambda self, *args: calls.append(args) or first)
+    second = classify_policy_document("mediclaim_policy.pdf", content)
+    assert calls == []
+    assert second.document_type == first.document_type
+    assert second.confidence_score == first.confidence_score
+    
+    # A different document is a miss
+    classify_policy_document("mediclaim_policy.pdf", content + " Hospital bill attached.")
+    assert len(calls) == 1
+
 def test_error_handling():
     """Test error handling scenarios."""
     print("\n🧪 Testing Error Handling")
@@ -331,6 +331,30 @@ def test_complete_rule_validation():
     
     return True
 
+def test_repeat_validation_is_memoized():
+    """Memoized reports match uncached validation and are not shared between callers."""
+    print("\n🧪 Testing Repeat Validation")
+    print("=" * 50)
+    
+    uncached = PolicyRuleValidator().validate_policy_rules(create_sample_policy_data(), create_sample_claim_data())
+    first = validate_policy_rules(create_sample_policy_data(), create_sample_claim_data())
+    second = validate_policy_rules(create_sample_policy_data(), create_sample_claim_data())
+    assert first == uncached
+    assert second == uncached
+    
+    # Each caller gets its own copy, so changing one report leaves the cached one intact
+    assert second is not first
+    first.recommendations.append("edited by caller")
+    assert validate_policy_rules(create_sample_policy_data(), create_sample_claim_data()) == uncached
+    
+    changed_policy = create_sample_policy_data()
+    changed_policy["co_payment"] = "50%"
+    changed = validate_policy_rules(changed_policy, create_sample_claim_data())
+    assert changed == PolicyRuleValidator().validate_policy_rules(changed_policy, create_sample_claim_data())
+    print(f"   Status (cached): {second.status}, status (changed policy): {changed.status}")
+    
+    return True
+
 def test_error_handling():
     """Test error handling scenarios."""
     print("\n🧪 Testing Error Handling")